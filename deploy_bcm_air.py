@@ -8,23 +8,139 @@ using stock Ubuntu 24.04 images and Ansible Galaxy playbooks.
 
 import os
 import sys
+import errno
 import time
 import json
+import shlex
+import shutil
+import socket
+import string
 import argparse
 import subprocess
 import re
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-import requests
-from dotenv import load_dotenv
 
 try:
     import yaml
 except ImportError:
     yaml = None  # Optional: features.yaml support requires PyYAML
 
-# Load environment variables from .env file
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional: faster JSON (de)serialization; stdlib json is used otherwise
+
+try:
+    import pexpect
+except ImportError:
+    pexpect = None  # Optional: in-process password bootstrap; the expect(1) tool is used otherwise
+
+# Repository root (this file lives at the top level)
+_MODULE_DIR = Path(__file__).resolve().parent
+_CLOUDINIT_PATH = _MODULE_DIR / 'cloud-init-password.yaml'
+_CLOUDINIT_TEMPLATE_PATH = _MODULE_DIR / 'sample-configs' / 'cloud-init-password.yaml.example'
+
+# Ansible Galaxy collection per BCM major version
+_BCM_COLLECTIONS = {
+    '10': 'brightcomputing.installer100',
+    '11': 'brightcomputing.installer110',
+}
+
+# ISO filenames like bcm-10.30.0-xxx.iso or bcm-11.0-xxx.iso
+_ISO_VERSION_RE = re.compile(r'bcm-?(10|11)\.?(\d+)?\.?(\d+)?', re.IGNORECASE)
+# BCM head node names like bcm-01, bcm_headnode0, BCM01
+_BCM_NODE_RE = re.compile(r'^bcm[-_]?', re.IGNORECASE)
+_NODE_NUM_RE = re.compile(r'\d+')
+# Fields Air API rows have used for the node interface (values like 'eth0' or 'bcm-01:eth0')
+_IFACE_KEYS = ('interface_name', 'interface', 'node_interface', 'iface')
+# Node states Air reports once a node is usable
+_READY_STATES = frozenset({'READY', 'RUNNING', 'LOADED', 'STARTED', 'BOOTED', 'UP'})
+# Switch detection for topology nodes (see _is_switch_node)
+_SWITCH_FUNCTIONS = frozenset({'leaf', 'spine', 'switch', 'oob-switch'})
+_SWITCH_OS_RE = re.compile(r'cumulus|sonic|switch', re.IGNORECASE)
+_SWITCH_NAME_RE = re.compile(r'leaf|spine|switch|tor|agg', re.IGNORECASE)
+# Output of an image that forces a password change on first login (sshpass can't answer it)
+_PWCHANGE_RE = re.compile(
+    r'current password|new password|password expired|must change|you are required to change',
+    re.IGNORECASE,
+)
+# __NAME__ placeholders in scripts/bcm_install.sh
+_SCRIPT_PLACEHOLDER_RE = re.compile(r'__([A-Z_]+)__')
+# ssh stderr fragments that mean "not reachable yet" rather than a login or script failure
+_SSH_CONNECT_ERRORS = (
+    'connection refused',
+    'connection reset',
+    'connection closed',
+    'connection timed out',
+    'kex_exchange_identification',
+)
+# sun_path size on Linux (macOS: 104); a Unix socket path must be shorter than this
+_SUN_PATH_MAX = 104 if sys.platform == 'darwin' else 108
+# Remote bootstrap for the BCM head node when cloud-init is unavailable (see
+# configure_node_passwords). Placeholders are filled with shell-quoted values;
+# shell variables are escaped as $$VAR for string.Template.
+_NODE_SETUP_SCRIPT = string.Template(r'''#!/bin/bash
+set -e
+
+NEW_HOSTNAME=${hostname}
+NEW_PASSWORD=${password}
+SSH_PUBKEY=${pubkey}
+
+echo "Configuring BCM head node..."
+
+# Set hostname (cloud-init usually does this; SSH bootstrap needs to be explicit)
+sudo hostnamectl set-hostname "$$NEW_HOSTNAME"
+if grep -qE "^127\.0\.1\.1\s+" /etc/hosts; then
+  sudo sed -i -E "s/^127\.0\.1\.1\s+.*/127.0.1.1 $$NEW_HOSTNAME/" /etc/hosts
+else
+  echo "127.0.1.1 $$NEW_HOSTNAME" | sudo tee -a /etc/hosts >/dev/null
+fi
+echo "  ✓ Hostname set to $$NEW_HOSTNAME"
+
+# Change ubuntu password
+printf '%s\n' "ubuntu:$$NEW_PASSWORD" | sudo chpasswd
+echo "  ✓ Ubuntu password changed"
+
+# Change root password
+printf '%s\n' "root:$$NEW_PASSWORD" | sudo chpasswd
+echo "  ✓ Root password changed"
+
+# Enable root SSH login
+sudo sed -i 's/^#*PermitRootLogin.*/PermitRootLogin yes/' /etc/ssh/sshd_config
+echo "  ✓ Root SSH login enabled"
+
+if [ -n "$$SSH_PUBKEY" ]; then
+  # Add SSH key for ubuntu user
+  mkdir -p ~/.ssh
+  chmod 700 ~/.ssh
+  printf '%s\n' "$$SSH_PUBKEY" >> ~/.ssh/authorized_keys
+  chmod 600 ~/.ssh/authorized_keys
+  sort -u ~/.ssh/authorized_keys -o ~/.ssh/authorized_keys
+  echo "  ✓ Ubuntu SSH key added"
+
+  # Add SSH key for root user
+  sudo mkdir -p /root/.ssh
+  sudo chmod 700 /root/.ssh
+  printf '%s\n' "$$SSH_PUBKEY" | sudo tee -a /root/.ssh/authorized_keys > /dev/null
+  sudo chmod 600 /root/.ssh/authorized_keys
+  echo "  ✓ Root SSH key added"
+else
+  echo "  ⚠ No SSH public key provided; skipping key setup"
+fi
+
+# Restart SSH and wait
+sudo systemctl restart ssh
+sleep 3
+echo "  ✓ SSH service restarted"
+echo "SETUP_COMPLETE"
+''')
 
 def _local_namespace() -> str | None:
     """
@@ -35,14 +151,110 @@ def _local_namespace() -> str | None:
     return ns or None
 
 
+def _json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _json_dumps_pretty(obj) -> bytes:
+    """Serialize to 2-space indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, indent=2, default=str).encode('utf-8')
+
+
+@lru_cache(maxsize=1)
+def _cloudinit_template() -> str:
+    """Read the cloud-init template once per process."""
+    return _CLOUDINIT_TEMPLATE_PATH.read_text()
+
+
+@lru_cache(maxsize=8)
+def _load_template(path: str, mtime_ns: int) -> tuple[str, ...]:
+    """
+    Read and pre-split a __NAME__ script template, cached until the file's mtime changes.
+    
+    Returns alternating literal text and placeholder names (names at odd indices).
+    """
+    return tuple(_SCRIPT_PLACEHOLDER_RE.split(Path(path).read_text()))
+
+
+def _render_template(parts: tuple[str, ...], subs: dict) -> str:
+    """Fill a template split by _load_template; unknown placeholders are left as-is."""
+    out = list(parts)
+    for i in range(1, len(out), 2):
+        name = out[i]
+        out[i] = subs.get(name, f'__{name}__')
+    return ''.join(out)
+
+
+@lru_cache(maxsize=4)
+def _read_ssh_public_key(path: str) -> str:
+    """Read (and cache) an SSH public key file."""
+    return Path(path).read_text().strip()
+
+
+def _print_indented(text: str, skip_prefix: str | None = None) -> None:
+    """Echo subprocess output indented by two spaces, as one write (blank lines dropped)."""
+    lines = [
+        f"  {line}\n" for line in text.strip().split('\n')
+        if line.strip() and not (skip_prefix and line.startswith(skip_prefix))
+    ]
+    if lines:
+        sys.stdout.write(''.join(lines))
+        sys.stdout.flush()
+
+
+def _row_interface_name(row: dict) -> str | None:
+    """Return the bare interface name (e.g. 'eth0') an API row refers to, if any."""
+    _get = dict.get
+    for key in _IFACE_KEYS:
+        value = _get(row, key)
+        if not isinstance(value, str):
+            continue
+        iface = value.rpartition(':')[2]
+        if iface.startswith('eth'):
+            return iface
+    return None
+
+
+def _poll_delay(attempt: int, base: float = 2.0, cap: float = 30.0) -> float:
+    """Exponential backoff with +/-20% jitter for API polling loops."""
+    return min(cap, base * 2 ** attempt) * random.uniform(0.8, 1.2)
+
+
+# fdatasync skips the metadata flush; macOS only has fsync
+_fdatasync = getattr(os, 'fdatasync', os.fsync)
+
+
+def _run_in_background(fn, *args, name: str = "air-bg", **kwargs):
+    """
+    Start fn(*args, **kwargs) on its own background thread and return its Future,
+    so callers only block when they need the result.
+    """
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+    future = pool.submit(fn, *args, **kwargs)
+    pool.shutdown(wait=False)
+    return future
+
+
 def _local_log_dir() -> Path:
-    base = Path(__file__).parent / ".logs"
+    base = _MODULE_DIR / ".logs"
     ns = _local_namespace()
     return (base / ns) if ns else base
 
 
 def _local_ssh_dir() -> Path:
-    base = Path(__file__).parent / ".ssh"
+    base = _MODULE_DIR / ".ssh"
     ns = _local_namespace()
     return (base / ns) if ns else base
 
@@ -66,27 +278,66 @@ class ProgressTracker:
         'features_configured',
         'completed'
     ]
+    _STEP_INDEX = {step: i for i, step in enumerate(STEPS)}
     
     def __init__(self, log_dir=None):
         self.log_dir = Path(log_dir) if log_dir else _local_log_dir()
         self.progress_file = self.log_dir / 'progress.json'
         self.data = self._load()
+        self._last_saved_hash = None
+        self._batch_depth = 0
     
     def _load(self):
         """Load progress from file"""
-        if self.progress_file.exists():
-            try:
-                with open(self.progress_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return {}
-        return {}
+        try:
+            return _json_loads(self.progress_file.read_bytes())
+        except (FileNotFoundError, ValueError, IOError):
+            return {}
     
     def _save(self):
-        """Save progress to file"""
+        """
+        Save progress to file.
+        Writes to a sibling temp file, syncs it and renames it into place so an interrupt
+        or power loss never leaves a truncated progress.json; skips the write if nothing changed.
+        """
+        if self._batch_depth:
+            return  # Written once when the outermost batch() exits
+        payload = _json_dumps_pretty(self.data)
+        payload_hash = hash(payload)
+        if payload_hash == self._last_saved_hash:
+            return
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.data, f, indent=2, default=str)
+        tmp_file = self.progress_file.with_suffix('.json.tmp')
+        # 0600 from creation: holds the node password
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            _fdatasync(f.fileno())  # Data on disk before the rename makes it visible
+        os.replace(tmp_file, self.progress_file)
+        self._last_saved_hash = payload_hash
+    
+    def flush(self):
+        """Write any pending progress to disk (for shutdown paths)"""
+        self._save()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Coalesce several set()/complete_step() calls into a single write.
+        
+        Usage:
+            with progress.batch():
+                progress.set(simulation_id=..., simulation_name=...)
+                progress.complete_step('simulation_created')
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._save()
     
     def get_last_step(self):
         """Get the last completed step"""
@@ -94,17 +345,23 @@ class ProgressTracker:
     
     def get_step_index(self, step):
         """Get index of a step"""
-        try:
-            return self.STEPS.index(step)
-        except ValueError:
-            return -1
+        return self._STEP_INDEX.get(step, -1)
     
     def is_step_completed(self, step):
         """Check if a step has been completed"""
         last_step = self.get_last_step()
         if not last_step:
             return False
-        return self.get_step_index(step) <= self.get_step_index(last_step)
+        return self._STEP_INDEX.get(step, -1) <= self._STEP_INDEX.get(last_step, -1)
+    
+    def completed_steps(self):
+        """Get the set of completed steps (steps complete in STEPS order)"""
+        last_index = self._STEP_INDEX.get(self.get_last_step(), -1)
+        return frozenset(self.STEPS[:last_index + 1])
+    
+    def all_steps_completed(self):
+        """Check if the whole deployment has been completed"""
+        return self.get_last_step() == self.STEPS[-1]
     
     def complete_step(self, step, **kwargs):
         """Mark a step as completed and store any associated data"""
@@ -120,14 +377,30 @@ class ProgressTracker:
 
     def set(self, **kwargs):
         """Store arbitrary metadata without advancing the last_step."""
+        if all(key in self.data and self.data[key] == value for key, value in kwargs.items()):
+            return  # Nothing changed (e.g. replay on resume) - avoid a rewrite
         for key, value in kwargs.items():
             self.data[key] = value
         self.data['last_updated'] = datetime.now().isoformat()
         self._save()
     
+    def transition(self, clear=False, **kwargs):
+        """
+        Move to a new recovery point in a single atomic write.
+        
+        Args:
+            clear: Drop all stored progress (steps and metadata) first
+            **kwargs: Values to store in the new state
+        """
+        self.data = {} if clear else dict(self.data)
+        self.data.update(kwargs)
+        self.data['last_updated'] = datetime.now().isoformat()
+        self._save()
+    
     def clear(self):
         """Clear all progress"""
         self.data = {}
+        self._last_saved_hash = None
         if self.progress_file.exists():
             self.progress_file.unlink()
     
@@ -215,9 +488,12 @@ class AirBCMDeployer:
         self._validate_ssh_keys()
         
         # Ensure cloud-init file exists (auto-generate from template if needed)
-        self._ensure_cloudinit_config()
+        self.ensure_cloud_init_config()
         # Note: BCM config is generated later, after password prompt
         
+        # One pooled HTTP session for all Air API calls (keep-alive avoids a TLS handshake per request)
+        self.session = self._create_session()
+        
         # Authenticate and get JWT token
         self.jwt_token = self._authenticate()
         
@@ -225,16 +501,21 @@ class AirBCMDeployer:
             'Authorization': f'Bearer {self.jwt_token}',
             'Content-Type': 'application/json'
         }
+        self.session.headers.update(self.headers)
         self.simulation_id = None
         self.bcm_node_id = None
     
     def _validate_ssh_keys(self):
-        """Validate that SSH key files exist"""
-        if not os.path.exists(self.ssh_private_key):
+        """Validate that SSH key files exist (and keep the public key text for later use)"""
+        try:
+            os.stat(self.ssh_private_key)
+        except FileNotFoundError:
             print(f"\n⚠ Warning: SSH private key not found: {self.ssh_private_key}")
             print(f"  SSH connections may fail. Update SSH_PRIVATE_KEY in .env")
         
-        if not os.path.exists(self.ssh_public_key):
+        try:
+            self._ssh_pubkey_text = _read_ssh_public_key(self.ssh_public_key)
+        except FileNotFoundError:
             print(f"\n✗ Error: SSH public key not found: {self.ssh_public_key}")
             print(f"\nPlease update SSH_PUBLIC_KEY in .env to point to your public key.")
             print(f"Common locations:")
@@ -242,49 +523,72 @@ class AirBCMDeployer:
             print(f"  ~/.ssh/id_ed25519.pub")
             raise FileNotFoundError(f"SSH public key not found: {self.ssh_public_key}")
     
-    def _ensure_cloudinit_config(self):
-        """
-        Ensure cloud-init-password.yaml exists.
-        If not, auto-generate it from the template using the user's SSH public key.
+    def _get_air_sdk(self):
         """
-        cloudinit_file = Path(__file__).parent / 'cloud-init-password.yaml'
-        template_file = Path(__file__).parent / 'sample-configs' / 'cloud-init-password.yaml.example'
-        
-        if cloudinit_file.exists():
-            return  # Already exists
-        
-        if not template_file.exists():
-            print(f"\n✗ Error: Cloud-init template not found: {template_file}")
-            raise FileNotFoundError("cloud-init-password.yaml.example not found")
-        
-        # Read the user's public key
-        try:
-            with open(self.ssh_public_key, 'r') as f:
-                public_key = f.read().strip()
-        except Exception as e:
-            print(f"\n✗ Error reading SSH public key: {e}")
-            raise
+        Return the shared Air SDK client, connecting on first use.
         
-        # Read template and replace placeholder with actual key
-        template_content = template_file.read_text()
-        cloudinit_content = template_content.replace('YOUR_SSH_PUBLIC_KEY_HERE', public_key)
+        Raises:
+            RuntimeError: If the SDK is disabled with --no-sdk
+            ImportError: If air_sdk is not installed
+        """
+        if getattr(self, "no_sdk", False):
+            raise RuntimeError("SDK disabled by --no-sdk")
+        air = getattr(self, '_air_sdk', None)
+        if air is None:
+            from air_sdk import AirApi
+            air = self._air_sdk = AirApi(
+                username=self.username,
+                password=self.api_token,
+                api_url=self.api_base_url
+            )
+        return air
+    
+    def _create_session(self):
+        """
+        Create a requests.Session with connection pooling and retries on transient 5xx.
         
-        # Write the cloud-init file
-        cloudinit_file.write_text(cloudinit_content)
-        print(f"\n✓ Auto-generated cloud-init-password.yaml with your SSH key")
-        print(f"  Public key: {self.ssh_public_key}")
+        Returns:
+            requests.Session instance
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,  # Hand the final response back so callers can inspect status_code
+            ),
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def close(self):
+        """Close the pooled HTTP session (its keep-alive connections to the Air API)"""
+        self.session.close()
     
     def _authenticate(self):
         """
-        Authenticate with Air API to get JWT token
+        Authenticate with Air API to get JWT token.
         
         Returns:
             JWT token string
         """
+        # Earlier versions cached the token in progress.json: don't leave it on disk
+        if self.progress.get('jwt_token'):
+            self.progress.set(jwt_token=None, jwt_expires_at=None,
+                              jwt_api_base_url=None, jwt_username=None)
+        
         login_url = f"{self.api_base_url}/api/v1/login/"
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 login_url,
                 data={
                     'username': self.username,
@@ -320,19 +624,15 @@ class AirBCMDeployer:
                 '11': [{'version': '11.30.0', 'file': Path, 'size_gb': float}, ...]
             }
         """
-        iso_dir = Path(__file__).parent / '.iso'
+        iso_dir = _MODULE_DIR / '.iso'
         result = {'10': [], '11': []}
         
         if not iso_dir.exists():
             return result
         
-        # Pattern to extract version: bcm-10.30.0-xxx.iso or bcm-11.0-xxx.iso
-        import re
-        version_pattern = re.compile(r'bcm-?(10|11)\.?(\d+)?\.?(\d+)?', re.IGNORECASE)
-        
         for iso_file in iso_dir.glob('*.iso'):
             name_lower = iso_file.name.lower()
-            match = version_pattern.search(name_lower)
+            match = _ISO_VERSION_RE.search(name_lower)
             
             if match:
                 major = match.group(1)  # '10' or '11'
@@ -346,12 +646,13 @@ class AirBCMDeployer:
                     'version': version,
                     'file': iso_file,
                     'size_gb': size_gb,
-                    'filename': iso_file.name
+                    'filename': iso_file.name,
+                    '_vkey': (int(major), int(minor), int(patch)),  # Pre-parsed sort key
                 })
         
         # Sort each list by version (newest first)
         for major in result:
-            result[major].sort(key=lambda x: [int(p) for p in x['version'].split('.')], reverse=True)
+            result[major].sort(key=itemgetter('_vkey'), reverse=True)
         
         return result
     
@@ -379,21 +680,14 @@ class AirBCMDeployer:
         print("\nAvailable BCM ISOs:")
         all_options = []
         
-        if bcm10_isos:
-            print("  BCM 10:")
-            for iso in bcm10_isos:
-                all_options.append(('10', iso))
-                print(f"    - {iso['version']}: {iso['filename']} ({iso['size_gb']:.2f} GB)")
-        else:
-            print("  BCM 10: (no ISOs found)")
-        
-        if bcm11_isos:
-            print("  BCM 11:")
-            for iso in bcm11_isos:
-                all_options.append(('11', iso))
+        for major, isos in (('10', bcm10_isos), ('11', bcm11_isos)):
+            if not isos:
+                print(f"  BCM {major}: (no ISOs found)")
+                continue
+            print(f"  BCM {major}:")
+            for iso in isos:
+                all_options.append((major, iso))
                 print(f"    - {iso['version']}: {iso['filename']} ({iso['size_gb']:.2f} GB)")
-        else:
-            print("  BCM 11: (no ISOs found)")
         
         if not all_options:
             print("\n✗ No BCM ISOs found in .iso/ directory")
@@ -404,13 +698,19 @@ class AirBCMDeployer:
         if requested_version:
             return self._resolve_requested_version(requested_version, available)
         
+        # Only one ISO available - nothing to choose
+        if len(all_options) == 1:
+            major, iso = all_options[0]
+            print(f"\n✓ Using BCM {iso['version']} ({iso['filename']})")
+            return iso['version'], _BCM_COLLECTIONS[major], iso['file']
+        
         # Non-interactive mode
         if self.non_interactive:
             # Default to BCM 10 if available, else BCM 11
             if len(bcm10_isos) == 1:
                 iso = bcm10_isos[0]
                 print(f"\n  [non-interactive] Using: BCM {iso['version']}")
-                return iso['version'], 'brightcomputing.installer100', iso['file']
+                return iso['version'], _BCM_COLLECTIONS['10'], iso['file']
             elif len(bcm10_isos) > 1:
                 print("\n✗ Multiple BCM 10 ISOs found. In non-interactive mode, use:")
                 print(f"   --bcm-version {bcm10_isos[0]['version']}")
@@ -420,7 +720,7 @@ class AirBCMDeployer:
             elif len(bcm11_isos) == 1:
                 iso = bcm11_isos[0]
                 print(f"\n  [non-interactive] Using: BCM {iso['version']}")
-                return iso['version'], 'brightcomputing.installer110', iso['file']
+                return iso['version'], _BCM_COLLECTIONS['11'], iso['file']
             elif len(bcm11_isos) > 1:
                 print("\n✗ Multiple BCM 11 ISOs found. In non-interactive mode, use:")
                 for iso in bcm11_isos:
@@ -446,7 +746,7 @@ class AirBCMDeployer:
             
             if 1 <= choice <= len(all_options):
                 major, iso = all_options[choice - 1]
-                collection = f'brightcomputing.installer{major}0'
+                collection = _BCM_COLLECTIONS[major]
                 print(f"\n✓ Selected: BCM {iso['version']}")
                 return iso['version'], collection, iso['file']
             else:
@@ -464,25 +764,20 @@ class AirBCMDeployer:
             tuple: (version_string, collection_name, iso_path) or (None, None, None)
         """
         # Determine major version
-        if requested_version.startswith('10'):
-            major = '10'
-            isos = available['10']
-            collection = 'brightcomputing.installer100'
-        elif requested_version.startswith('11'):
-            major = '11'
-            isos = available['11']
-            collection = 'brightcomputing.installer110'
-        else:
+        major = requested_version[:2]
+        collection = _BCM_COLLECTIONS.get(major)
+        if collection is None:
             print(f"\n✗ Invalid BCM version: {requested_version}")
             print("  Version must start with 10 or 11 (e.g., 10, 11, 10.30.0, 11.30.0)")
             return None, None, None
+        isos = available.get(major, [])
         
         if not isos:
             print(f"\n✗ No BCM {major} ISOs found in .iso/ directory")
             return None, None, None
         
         # If just major version requested (10 or 11)
-        if requested_version in ('10', '11'):
+        if requested_version in _BCM_COLLECTIONS:
             if len(isos) == 1:
                 iso = isos[0]
                 print(f"\n✓ Using BCM {iso['version']} ({iso['filename']})")
@@ -541,44 +836,42 @@ class AirBCMDeployer:
     def ensure_cloud_init_config(self):
         """
         Ensure cloud-init-password.yaml exists by generating it from template.
-        Uses SSH_PUBLIC_KEY from .env to populate the SSH key.
+        Uses SSH_PUBLIC_KEY from .env to populate the SSH key; an existing file is
+        regenerated if it does not contain the current key.
         
         Returns:
             Path to cloud-init config file
         """
-        cloudinit_path = Path(__file__).parent / 'cloud-init-password.yaml'
-        template_path = Path(__file__).parent / 'sample-configs' / 'cloud-init-password.yaml.example'
-        
-        if cloudinit_path.exists():
-            print(f"  ✓ Using existing cloud-init config: {cloudinit_path.name}")
-            return cloudinit_path
+        cloudinit_path = _CLOUDINIT_PATH
         
-        # Need to generate from template
-        if not template_path.exists():
-            print(f"  ✗ Cloud-init template not found: {template_path}")
-            raise FileNotFoundError(f"Missing template: {template_path}")
-        
-        # Read public key
-        ssh_pub_key_path = Path(self.ssh_public_key)
-        if not ssh_pub_key_path.exists():
-            print(f"\n✗ SSH public key not found: {self.ssh_public_key}")
-            print(f"\nPlease check SSH_PUBLIC_KEY in your .env file.")
-            print(f"Current value: {self.ssh_public_key}")
-            raise FileNotFoundError(f"SSH public key not found: {self.ssh_public_key}")
+        # Read the user's public key
+        try:
+            ssh_public_key_content = getattr(self, '_ssh_pubkey_text', None) or _read_ssh_public_key(self.ssh_public_key)
+        except Exception as e:
+            print(f"\n✗ Error reading SSH public key: {e}")
+            raise
         
-        ssh_public_key_content = ssh_pub_key_path.read_text().strip()
+        # Keep the existing file unless SSH_PUBLIC_KEY was rotated since it was generated
+        try:
+            if ssh_public_key_content in cloudinit_path.read_text():
+                return cloudinit_path
+            print(f"\nℹ SSH public key changed; regenerating {cloudinit_path.name}")
+        except FileNotFoundError:
+            pass
         
-        # Read template and replace placeholder
-        template_content = template_path.read_text()
+        # Need to generate from template
+        try:
+            template_content = _cloudinit_template()
+        except FileNotFoundError:
+            print(f"\n✗ Error: Cloud-init template not found: {_CLOUDINIT_TEMPLATE_PATH}")
+            raise FileNotFoundError(f"Missing template: {_CLOUDINIT_TEMPLATE_PATH}")
         
-        # Replace the placeholder with actual key
+        # Replace the placeholder with actual key and write the generated config
         cloudinit_content = template_content.replace('YOUR_SSH_PUBLIC_KEY_HERE', ssh_public_key_content)
-        
-        # Write the generated config
         cloudinit_path.write_text(cloudinit_content)
         
-        print(f"  ✓ Generated cloud-init config from template")
-        print(f"    SSH public key: {self.ssh_public_key}")
+        print(f"\n✓ Auto-generated cloud-init-password.yaml with your SSH key")
+        print(f"  Public key: {self.ssh_public_key}")
         
         return cloudinit_path
     
@@ -597,13 +890,9 @@ class AirBCMDeployer:
         Raises:
             Exception if no BCM node is found
         """
-        import re
-        
         # Filter for BCM nodes (start with 'bcm' or 'bcm-')
-        bcm_nodes = []
-        for node_name in nodes_dict.keys():
-            if re.match(r'^bcm[-_]?', node_name, re.IGNORECASE):
-                bcm_nodes.append(node_name)
+        is_bcm = _BCM_NODE_RE.match
+        bcm_nodes = [node_name for node_name in nodes_dict if is_bcm(node_name)]
         
         if not bcm_nodes:
             raise Exception(
@@ -615,7 +904,7 @@ class AirBCMDeployer:
         # If multiple BCM nodes, sort and pick the one with lowest number
         if len(bcm_nodes) > 1:
             def get_node_number(name):
-                numbers = re.findall(r'\d+', name)
+                numbers = _NODE_NUM_RE.findall(name)
                 return int(numbers[0]) if numbers else 999
             
             bcm_nodes.sort(key=get_node_number)
@@ -625,6 +914,48 @@ class AirBCMDeployer:
         self.bcm_node_name = bcm_nodes[0]
         return bcm_nodes[0]
     
+    def _scan_bcm_links(self, topology_data):
+        """
+        Walk the topology links once and record, for the BCM node, the interface
+        wired to "outbound" and the interface wired to oob-mgmt-switch. Stops as soon
+        as both are found. Results are cached per topology object.
+        """
+        target = getattr(self, 'bcm_node_name', None)
+        cache_key = (id(topology_data), target)
+        if getattr(self, '_bcm_links_cache_key', None) == cache_key:
+            return
+        
+        outbound_iface = None
+        oob_mgmt_iface = None
+        _dict = dict
+        
+        for link in topology_data.get('content', {}).get('links', []) if target else ():
+            if len(link) != 2:
+                continue
+            endpoint1, endpoint2 = link
+            
+            # endpoint can be a dict {"interface": "eth4", "node": "bcm-01"} or string "outbound".
+            # Normalize each to (node, interface) once; string endpoints have no node.
+            node1, iface1 = (endpoint1.get('node'), endpoint1.get('interface')) if type(endpoint1) is _dict else (None, None)
+            node2, iface2 = (endpoint2.get('node'), endpoint2.get('interface')) if type(endpoint2) is _dict else (None, None)
+            
+            for node, iface, peer, peer_node in ((node1, iface1, endpoint2, node2), (node2, iface2, endpoint1, node1)):
+                if node != target:
+                    continue
+                if peer == "outbound":
+                    if outbound_iface is None:
+                        outbound_iface = iface
+                elif peer_node == 'oob-mgmt-switch':
+                    if oob_mgmt_iface is None:
+                        oob_mgmt_iface = iface
+            
+            if outbound_iface is not None and oob_mgmt_iface is not None:
+                break
+        
+        self._bcm_outbound_iface = outbound_iface
+        self._bcm_oob_mgmt_iface = oob_mgmt_iface
+        self._bcm_links_cache_key = cache_key
+    
     def detect_bcm_outbound_interface(self, topology_data):
         """
         Detect which interface on the BCM node connects to "outbound".
@@ -636,30 +967,17 @@ class AirBCMDeployer:
         Returns:
             Interface name (e.g., 'eth0', 'eth4') or None if not found
         """
-        links = topology_data.get('content', {}).get('links', [])
+        target = getattr(self, 'bcm_node_name', None)
+        if not target:
+            return None
         
-        for link in links:
-            if len(link) != 2:
-                continue
-            
-            # Check if this link connects BCM node to "outbound"
-            endpoint1 = link[0]
-            endpoint2 = link[1]
-            
-            # endpoint can be a dict {"interface": "eth4", "node": "bcm-01"} or string "outbound"
-            if isinstance(endpoint1, dict) and endpoint2 == "outbound":
-                if endpoint1.get('node') == self.bcm_node_name:
-                    iface = endpoint1.get('interface')
-                    print(f"  ✓ BCM outbound interface detected: {self.bcm_node_name}:{iface}")
-                    return iface
-            
-            if isinstance(endpoint2, dict) and endpoint1 == "outbound":
-                if endpoint2.get('node') == self.bcm_node_name:
-                    iface = endpoint2.get('interface')
-                    print(f"  ✓ BCM outbound interface detected: {self.bcm_node_name}:{iface}")
-                    return iface
+        self._scan_bcm_links(topology_data)
+        iface = self._bcm_outbound_iface
+        if iface:
+            print(f"  ✓ BCM outbound interface detected: {target}:{iface}")
+            return iface
         
-        print(f"  ⚠ No outbound interface found for {self.bcm_node_name}")
+        print(f"  ⚠ No outbound interface found for {target}")
         return None
     
     def detect_bcm_management_interface(self, topology_data):
@@ -673,35 +991,43 @@ class AirBCMDeployer:
         Returns:
             Interface name (e.g., 'eth0', 'eth1') or None if not found
         """
-        links = topology_data.get('content', {}).get('links', [])
+        target = getattr(self, 'bcm_node_name', None)
+        if not target:
+            return None
         
-        for link in links:
-            if len(link) != 2:
-                continue
-            
-            endpoint1 = link[0]
-            endpoint2 = link[1]
-            
-            # Check if BCM node connects to oob-mgmt-switch
-            if isinstance(endpoint1, dict) and isinstance(endpoint2, dict):
-                if endpoint1.get('node') == self.bcm_node_name and endpoint2.get('node') == 'oob-mgmt-switch':
-                    iface = endpoint1.get('interface')
-                    print(f"  ✓ BCM management interface detected: {self.bcm_node_name}:{iface} → oob-mgmt-switch")
-                    return iface
-                if endpoint2.get('node') == self.bcm_node_name and endpoint1.get('node') == 'oob-mgmt-switch':
-                    iface = endpoint2.get('interface')
-                    print(f"  ✓ BCM management interface detected: {self.bcm_node_name}:{iface} → oob-mgmt-switch")
-                    return iface
-        
-        print(f"  ⚠ No oob-mgmt-switch connection found for {self.bcm_node_name}")
+        self._scan_bcm_links(topology_data)
+        iface = self._bcm_oob_mgmt_iface
+        if iface:
+            print(f"  ✓ BCM management interface detected: {target}:{iface} → oob-mgmt-switch")
+            return iface
+        
+        print(f"  ⚠ No oob-mgmt-switch connection found for {target}")
         return None
     
     def _get_topology_nodes(self):
         """
         Get node configurations from the loaded topology.
+        If create_simulation didn't run in this process (--resume), parse self.topology_file
+        instead; that parse is memoized on the file's mtime.
         Returns dict of node_name -> node_config, or None if not available.
         """
-        return getattr(self, '_topology_nodes_cache', None)
+        nodes = getattr(self, '_topology_nodes_cache', None)
+        if nodes is not None:
+            return nodes
+        
+        path = getattr(self, 'topology_file', None)
+        if not path:
+            return None
+        try:
+            key = (str(path), os.stat(path).st_mtime_ns)
+            cached = getattr(self, '_topology_file_cache', None)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            nodes = _json_loads(Path(path).read_bytes()).get('content', {}).get('nodes', {})
+        except (OSError, ValueError):
+            return None
+        self._topology_file_cache = (key, nodes)
+        return nodes
     
     def _cache_topology_nodes(self, topology_data):
         """Cache topology node configurations for later use"""
@@ -739,20 +1065,25 @@ class AirBCMDeployer:
         """
         # Check function attribute
         function = topo_node.get('function', '').lower()
-        if function in ['leaf', 'spine', 'switch', 'oob-switch']:
+        if function in _SWITCH_FUNCTIONS:
             return True
         
         # Check OS for switch indicators
-        node_os = topo_node.get('os', '').lower()
-        if any(x in node_os for x in ['cumulus', 'sonic', 'switch']):
+        if _SWITCH_OS_RE.search(topo_node.get('os', '')):
             return True
         
         # Check name patterns as fallback
-        name_lower = node_name.lower()
-        if any(x in name_lower for x in ['leaf', 'spine', 'switch', 'tor', 'agg']):
-            return True
-        
-        return False
+        return bool(_SWITCH_NAME_RE.search(node_name))
+    
+    def _cloudinit_skip_reason(self, node_name, topo_node):
+        """Return why a node can't take cloud-init ('switch' or 'PXE boot'), or None."""
+        # Switches are detected by function, OS or name
+        if self._is_switch_node(node_name, topo_node):
+            return 'switch'
+        # PXE boot clients are detected by boot setting or OS
+        if self._is_pxe_boot_node(node_name, topo_node):
+            return 'PXE boot'
+        return None
     
     def get_next_simulation_name(self):
         """
@@ -766,28 +1097,34 @@ class AirBCMDeployer:
         now = datetime.now()
         year_month = now.strftime('%Y%m')  # YYYYMM format
         
-        # Pattern to match our naming convention
-        pattern = re.compile(rf'^{year_month}(\d{{3}})-BCM-Lab$')
-        
-        # Get list of existing simulations
+        # Pattern to match our naming convention (compiled once per month).
+        # MULTILINE so one findall can scan every title joined by newlines.
+        cached = getattr(self, '_sim_name_re', None)
+        if cached is None or cached[0] != year_month:
+            cached = self._sim_name_re = (year_month, re.compile(rf'^{year_month}(\d{{3}})-BCM-Lab$', re.MULTILINE))
+        pattern = cached[1]
+        
+        # Get list of existing simulations. Ask the server for this month's titles only;
+        # if it rejects the filter, remember that and list everything (titles are
+        # matched client-side either way, so an ignored filter is harmless).
+        url = f"{self.api_base_url}/api/v2/simulations/"
         try:
-            response = requests.get(
-                f"{self.api_base_url}/api/v2/simulations/",
-                headers=self.headers,
-                timeout=30
-            )
+            response = None
+            if getattr(self, '_sim_title_filter_supported', True):
+                response = self.session.get(url, params={'title__startswith': year_month}, timeout=30)
+                if response.status_code == 400:
+                    self._sim_title_filter_supported = False
+                    response = None
+            if response is None:
+                response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
                 simulations = data.get('results', [])
                 
-                # Find all matching sequence numbers for this year-month
-                sequence_numbers = []
-                for sim in simulations:
-                    title = sim.get('title', '')
-                    match = pattern.match(title)
-                    if match:
-                        sequence_numbers.append(int(match.group(1)))
+                # Find all matching sequence numbers for this year-month in a single regex pass
+                titles = '\n'.join(sim.get('title') or '' for sim in simulations)
+                sequence_numbers = [int(seq) for seq in pattern.findall(titles)]
                 
                 # Get next sequence number
                 if sequence_numbers:
@@ -845,11 +1182,14 @@ class AirBCMDeployer:
         Returns:
             Simulation ID
         """
+        import requests
+        
         print("\n" + "="*60)
         print("Creating NVIDIA Air Simulation")
         print("="*60)
         
         topology_path = Path(topology_file_path)
+        self.topology_file = topology_path
         file_ext = topology_path.suffix.lower()
         
         if file_ext != '.json':
@@ -859,9 +1199,8 @@ class AirBCMDeployer:
                 "See topologies/topology-design.md for requirements."
             )
         
-        # JSON format - read and parse
-        with open(topology_path, 'r') as f:
-            topology_data = json.load(f)
+        # JSON format - read and parse (raw bytes are kept as the upload body)
+        topology_data = _json_loads(topology_path.read_bytes())
         
         # Detect BCM node from JSON topology
         nodes = topology_data.get('content', {}).get('nodes', {})
@@ -888,15 +1227,14 @@ class AirBCMDeployer:
         print(f"\nCreating simulation from JSON file: {simulation_name}")
         
         # Override title with our simulation name
-        topology_data['title'] = simulation_name
         payload = topology_data
-        content_size = len(json.dumps(topology_data))
+        payload['title'] = simulation_name
+        body = _json_dumps(payload)
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/api/v2/simulations/import/",
-                headers=self.headers,
-                json=payload,
+                data=body,  # Session headers carry Content-Type: application/json
                 timeout=60
             )
             
@@ -937,7 +1275,7 @@ class AirBCMDeployer:
                 print(f"Response: {response.text}")
                 print(f"Request URL: {self.api_base_url}/api/v2/simulations/import/")
                 print(f"Request payload keys: {list(payload.keys())}")
-                print(f"Topology file size: {content_size} bytes")
+                print(f"Topology upload size: {len(body)} bytes")
                 raise Exception("Failed to create simulation")
                 
         except requests.exceptions.ConnectionError as e:
@@ -978,17 +1316,15 @@ class AirBCMDeployer:
         """
         print(f"\nWaiting for node '{node_name}' to be ready...")
         print(f"  Checking for states: READY, RUNNING, LOADED, STARTED, BOOTED, UP")
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
         last_state = None
         check_count = 0
+        attempt = 0
         first_check = True
         
         # Use Air SDK for reliable node listing (same method that works for cloud-init)
         try:
-            if getattr(self, "no_sdk", False):
-                raise RuntimeError("SDK disabled by --no-sdk")
-            from air_sdk import AirApi
-            air = AirApi(api_url=self.api_base_url, bearer_token=self.jwt_token)
+            air = self._get_air_sdk()
             sim = air.simulations.get(self.simulation_id)
             use_sdk = True
             print(f"  Using Air SDK for node status...")
@@ -996,50 +1332,51 @@ class AirBCMDeployer:
             print(f"  SDK unavailable ({e}), using REST API...")
             use_sdk = False
         
-        while time.time() - start_time < timeout:
+        while time.monotonic() < deadline:
             try:
+                # Normalized (name, state, id, raw node) tuples, built once per poll
                 nodes = []
                 
                 if use_sdk:
                     # Use SDK to get nodes - this is what worked for cloud-init
                     try:
-                        sdk_nodes = list(sim.nodes)
-                        for n in sdk_nodes:
-                            nodes.append({
-                                'name': n.name,
-                                'state': getattr(n, 'state', 'unknown'),
-                                'id': str(n.id) if hasattr(n, 'id') else None
-                            })
+                        for n in sim.nodes:
+                            node_id = getattr(n, 'id', None)
+                            nodes.append((
+                                n.name,
+                                getattr(n, 'state', 'unknown'),
+                                str(node_id) if node_id is not None else None,
+                                n,
+                            ))
                     except Exception as e:
                         print(f"  SDK error: {e}, falling back to REST API")
                         use_sdk = False
                 
                 if not use_sdk:
                     # Fallback to REST API
-                    response = requests.get(
+                    response = self.session.get(
                         # NOTE: On https://air.nvidia.com, the OpenAPI spec defines node listing as:
                         #   GET /api/v2/simulations/nodes/?simulation=<simulation_uuid>
                         # not /api/v2/simulations/<id>/nodes/
                         f"{self.api_base_url}/api/v2/simulations/nodes/",
-                        headers=self.headers,
                         params={"simulation": self.simulation_id},
                         timeout=30
                     )
                     
                     if response.status_code == 200:
                         data = response.json()
-                        if isinstance(data, list):
-                            nodes = data
-                        else:
-                            nodes = data.get('results', [])
+                        rows = data if isinstance(data, list) else data.get('results', [])
+                        nodes = [
+                            (row.get('name'), row.get('state', 'unknown'), row.get('id'), row)
+                            for row in rows
+                            if isinstance(row, dict)
+                        ]
                 
                 # On first check, show all node states for debugging
                 if first_check:
                     print(f"\n  All nodes in simulation ({len(nodes)} found):")
                     if nodes:
-                        for n in nodes:
-                            name = n.get('name') if isinstance(n, dict) else getattr(n, 'name', 'unknown')
-                            state = n.get('state', 'unknown') if isinstance(n, dict) else getattr(n, 'state', 'unknown')
+                        for name, state, _, _ in nodes:
                             print(f"    • {name}: {state}")
                     else:
                         print(f"    (no nodes returned)")
@@ -1047,17 +1384,16 @@ class AirBCMDeployer:
                     first_check = False
                 
                 # Check if target node is in the list
-                target_node = None
-                for node in nodes:
-                    name = node.get('name') if isinstance(node, dict) else getattr(node, 'name', None)
-                    if name == node_name:
-                        target_node = node
-                        break
+                target_node = next((t for t in nodes if t[0] == node_name), None)
                 
                 if target_node:
-                    state = target_node.get('state', 'unknown') if isinstance(target_node, dict) else getattr(target_node, 'state', 'unknown')
+                    _, state, node_id, node_obj = target_node
                     
-                    # Print state if it changed or every 6th check (~60 seconds)
+                    # Poll quickly again after a transition; back off while the state is steady
+                    if state != last_state:
+                        attempt = 0
+                    
+                    # Print state if it changed or every 6th check
                     if state != last_state or check_count % 6 == 0:
                         print(f"  Node '{node_name}' state: {state}                    ")
                         last_state = state
@@ -1065,22 +1401,22 @@ class AirBCMDeployer:
                     check_count += 1
                     
                     # Accept various ready states that Air might return
-                    ready_states = ['READY', 'RUNNING', 'LOADED', 'STARTED', 'BOOTED', 'UP']
-                    if state in ready_states or (state and str(state).upper() in ready_states):
-                        node_id = target_node.get('id') if isinstance(target_node, dict) else getattr(target_node, 'id', None)
+                    if state in _READY_STATES or (state and str(state).upper() in _READY_STATES):
                         self.bcm_node_id = str(node_id) if node_id else None
                         print(f"✓ Node '{node_name}' is ready! (State: {state})")
-                        return target_node
+                        return node_obj
                 else:
                     # Node not found in results - print message periodically
                     if check_count % 6 == 0:
                         print(f"  Node '{node_name}' not found in API response (checking...)                    ")
                     check_count += 1
                 
-                time.sleep(10)
+                time.sleep(_poll_delay(attempt))
+                attempt += 1
             except Exception as e:
                 print(f"  Error checking node status: {e}                    ")
-                time.sleep(10)
+                time.sleep(_poll_delay(attempt))
+                attempt += 1
         
         raise Exception(f"Timeout waiting for node '{node_name}' to be ready")
     
@@ -1094,9 +1430,9 @@ class AirBCMDeployer:
         Returns:
             Dictionary with SSH connection details
         """
-        response = requests.get(
+        response = self.session.get(
             f"{self.api_base_url}/api/v2/nodes/{node_id}/console/",
-            headers=self.headers
+            timeout=30
         )
         
         if response.status_code == 200:
@@ -1110,9 +1446,8 @@ class AirBCMDeployer:
         print("\nStarting simulation...")
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/api/v2/simulations/{self.simulation_id}/load/",
-                headers=self.headers,
                 timeout=30
             )
             
@@ -1137,14 +1472,15 @@ class AirBCMDeployer:
             True if loaded, False if timeout
         """
         print("\nWaiting for simulation to finish loading...")
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
         last_sim_data = None
+        last_state = None
+        attempt = 0
         
-        while time.time() - start_time < timeout:
+        while time.monotonic() < deadline:
             try:
-                response = requests.get(
+                response = self.session.get(
                     f"{self.api_base_url}/api/v2/simulations/{self.simulation_id}/",
-                    headers=self.headers,
                     timeout=30
                 )
                 
@@ -1152,7 +1488,11 @@ class AirBCMDeployer:
                     sim_data = response.json()
                     last_sim_data = sim_data
                     state = sim_data.get('state', 'unknown')
-                    print(f"  Simulation state: {state}                    ", end='\r')
+                    # Only redraw the status line when the state actually changes
+                    if state != last_state:
+                        print(f"  Simulation state: {state:<30}", end='\r')
+                        attempt = 0
+                        last_state = state
                     
                     if state == 'LOADED':
                         print(f"\n✓ Simulation is fully loaded!                    ")
@@ -1165,10 +1505,12 @@ class AirBCMDeployer:
                         )
                         return False
                 
-                time.sleep(5)
+                time.sleep(_poll_delay(attempt))
+                attempt += 1
             except Exception as e:
                 print(f"  Error checking simulation state: {e}                    ", end='\r')
-                time.sleep(5)
+                time.sleep(_poll_delay(attempt))
+                attempt += 1
         
         print(f"\n⚠ Timeout waiting for simulation to load")
         self._dump_simulation_failure_diagnostics(
@@ -1178,6 +1520,26 @@ class AirBCMDeployer:
         return False
 
     def _dump_simulation_failure_diagnostics(self, reason: str, sim_data: dict | None = None) -> None:
+        """
+        Start the best-effort diagnostics dump on a background thread so failure
+        feedback isn't held up by the API calls. Call wait_for_diagnostics() before
+        anything that changes the simulation (e.g. deleting it).
+        """
+        thread = threading.Thread(
+            target=self._write_simulation_failure_diagnostics,
+            args=(reason, sim_data),
+            name="air-diagnostics",
+        )
+        self._diag_thread = thread
+        thread.start()
+    
+    def wait_for_diagnostics(self, timeout: float | None = 120) -> None:
+        """Block until a pending diagnostics dump (if any) has finished writing."""
+        thread = getattr(self, '_diag_thread', None)
+        if thread is not None:
+            thread.join(timeout)
+    
+    def _write_simulation_failure_diagnostics(self, reason: str, sim_data: dict | None = None) -> None:
         """
         Best-effort diagnostics dump when a simulation fails to load.
         Writes a single JSON file into .logs/ with details that often contain the root cause.
@@ -1193,16 +1555,44 @@ class AirBCMDeployer:
             ts = datetime.now().strftime("%Y%m%d-%H%M%S")
             out_path = log_dir / f"air-sim-failure-{sim_id}-{ts}.json"
 
-            def _get_json(url: str, params: dict | None = None) -> dict:
-                resp = requests.get(url, headers=self.headers, params=params, timeout=30)
+            def _get_json(url: str, params: dict | None = None, max_bytes: int = 2_000_000) -> dict:
+                # Runs on pool threads: report request failures per endpoint instead of raising,
+                # so one unreachable URL doesn't abort the whole dump.
+                # Bodies are streamed and capped at max_bytes; oversized ones are stored as
+                # truncated text instead of being parsed.
+                try:
+                    with self.session.get(url, params=params, timeout=30, stream=True) as resp:
+                        chunks = []
+                        size = 0
+                        for chunk in resp.iter_content(chunk_size=65536):
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if size > max_bytes:
+                                break
+                        body = b"".join(chunks)
+                except Exception as e:
+                    return {"ok": False, "status_code": None, "error": str(e)}
+                headers = dict(resp.headers)
+                if size > max_bytes:
+                    return {
+                        "ok": False,
+                        "status_code": resp.status_code,
+                        "headers": headers,
+                        "truncated": True,
+                        "size_read": size,
+                        "text": body[:max_bytes].decode("utf-8", errors="replace"),
+                    }
                 ct = (resp.headers.get("content-type") or "").lower()
                 if resp.status_code == 200 and "application/json" in ct:
-                    return {"ok": True, "status_code": resp.status_code, "json": resp.json(), "headers": dict(resp.headers)}
+                    try:
+                        return {"ok": True, "status_code": resp.status_code, "json": _json_loads(body), "headers": headers}
+                    except ValueError:
+                        pass  # Malformed JSON: fall through and keep the raw text
                 return {
                     "ok": False,
                     "status_code": resp.status_code,
-                    "headers": dict(resp.headers),
-                    "text": (resp.text or "")[:4000],
+                    "headers": headers,
+                    "text": body[:4000].decode("utf-8", errors="replace"),
                 }
 
             base = self.api_base_url.rstrip("/")
@@ -1220,11 +1610,7 @@ class AirBCMDeployer:
             # SDK (when installed) can expose additional objects/fields and clearer errors than raw REST.
             # https://docs.nvidia.com/networking-ethernet-software/nvidia-air/Air-Python-SDK/
             try:
-                if getattr(self, "no_sdk", False):
-                    raise RuntimeError("SDK disabled by --no-sdk")
-                from air_sdk import AirApi  # type: ignore
-
-                air = AirApi(username=self.username, password=self.api_token, api_url=base)
+                air = self._get_air_sdk()
                 diag["sdk"]["available"] = True
 
                 def _sdk_safe(obj, max_len: int = 20000):
@@ -1239,110 +1625,113 @@ class AirBCMDeployer:
                     except Exception as e:
                         return {"error": str(e)}
 
-                # Simulation (often includes fields not present in our v2 REST response)
-                try:
-                    sim_obj = air.simulations.get(sim_id)
-                    diag["sdk"]["simulation"] = _sdk_safe(sim_obj)
-                except Exception as e:
-                    diag["sdk"]["simulation_error"] = str(e)
-
+                # Each SDK call is an independent network round trip; run them concurrently.
+                sdk_calls = {
+                    # Simulation (often includes fields not present in our v2 REST response)
+                    "simulation": lambda: air.simulations.get(sim_id),
+                }
                 # Jobs (useful for “capacity/scheduling” failures; filter by simulation when supported)
-                try:
-                    jobs_api = getattr(air, "jobs", None)
-                    if jobs_api and hasattr(jobs_api, "list"):
-                        diag["sdk"]["jobs"] = _sdk_safe(jobs_api.list(simulation=sim_id))
-                except Exception as e:
-                    diag["sdk"]["jobs_error"] = str(e)
-
+                jobs_api = getattr(air, "jobs", None)
+                if jobs_api and hasattr(jobs_api, "list"):
+                    sdk_calls["jobs"] = lambda: jobs_api.list(simulation=sim_id)
                 # Simulation nodes (often includes per-node state/error)
-                try:
-                    sim_nodes_api = getattr(air, "simulation_nodes", None)
-                    if sim_nodes_api and hasattr(sim_nodes_api, "list"):
-                        diag["sdk"]["simulation_nodes"] = _sdk_safe(sim_nodes_api.list(simulation=sim_id))
-                except Exception as e:
-                    diag["sdk"]["simulation_nodes_error"] = str(e)
-
+                sim_nodes_api = getattr(air, "simulation_nodes", None)
+                if sim_nodes_api and hasattr(sim_nodes_api, "list"):
+                    sdk_calls["simulation_nodes"] = lambda: sim_nodes_api.list(simulation=sim_id)
                 # Capacity (if available, can immediately explain “can’t place this sim right now”)
-                try:
-                    capacity_api = getattr(air, "capacity", None)
-                    if capacity_api and hasattr(capacity_api, "get"):
-                        diag["sdk"]["capacity"] = _sdk_safe(capacity_api.get())
-                except Exception as e:
-                    diag["sdk"]["capacity_error"] = str(e)
+                capacity_api = getattr(air, "capacity", None)
+                if capacity_api and hasattr(capacity_api, "get"):
+                    sdk_calls["capacity"] = capacity_api.get
+
+                with ThreadPoolExecutor(max_workers=len(sdk_calls)) as pool:
+                    pending = {name: pool.submit(lambda fn=fn: _sdk_safe(fn())) for name, fn in sdk_calls.items()}
+                    for name, future in pending.items():
+                        try:
+                            diag["sdk"][name] = future.result(timeout=60)
+                        except Exception as e:
+                            diag["sdk"][f"{name}_error"] = str(e)
             except Exception as e:
                 diag["sdk"]["available"] = False
                 diag["sdk"]["import_error"] = str(e)
 
-            # v2 sim details (often contains state_message/error_message)
-            diag["endpoints"]["simulation"] = _get_json(f"{base}/api/v2/simulations/{sim_id}/")
-            # nodes (node-level error_message is very helpful)
-            # NOTE: external air.nvidia.com does not expose /api/v2/simulations/{id}/nodes/
-            # The OpenAPI spec defines /api/v2/simulations/nodes/?simulation=<id>
-            diag["endpoints"]["nodes"] = _get_json(
-                f"{base}/api/v2/simulations/nodes/",
-                params={"simulation": sim_id},
-            )
-            # jobs + events (usually show the failing operation/reason)
-            # NOTE: OpenAPI spec defines /api/v2/jobs/?simulation=<id>
-            diag["endpoints"]["jobs"] = _get_json(
-                f"{base}/api/v2/jobs/",
-                params={"simulation": sim_id},
-            )
-            # v1 job endpoints often include additional fields (e.g., "notes") that can contain failure reasons.
-            # /api/v2/jobs/{id}/ returns JobShort for non-worker clients (no error details).
-            try:
-                jobs_json = diag["endpoints"]["jobs"].get("json") if isinstance(diag["endpoints"]["jobs"], dict) else None
-                v2_job_results = []
-                if isinstance(jobs_json, dict) and isinstance(jobs_json.get("results"), list):
-                    v2_job_results = jobs_json["results"]
-                failed_job_ids = [
-                    j.get("id")
-                    for j in v2_job_results
-                    if isinstance(j, dict) and j.get("state") == "FAILED"
-                ]
-                # Prioritize START failures
-                failed_job_ids = (
-                    [j.get("id") for j in v2_job_results if isinstance(j, dict) and j.get("state") == "FAILED" and j.get("category") == "START"]
-                    + [jid for jid in failed_job_ids if jid]
-                )
-                # De-dupe while preserving order
-                seen = set()
-                failed_job_ids = [jid for jid in failed_job_ids if jid and not (jid in seen or seen.add(jid))]
-
-                diag["endpoints"]["jobs_v1_failed_details"] = {}
-                for jid in failed_job_ids[:5]:
-                    diag["endpoints"]["jobs_v1_failed_details"][jid] = _get_json(f"{base}/api/v1/job/{jid}/")
-                # If v1 job includes a worker URL, fetch that too (often has availability/health clues).
-                worker_urls = []
-                for job_detail in diag["endpoints"]["jobs_v1_failed_details"].values():
-                    if not isinstance(job_detail, dict):
-                        continue
-                    j = job_detail.get("json")
-                    if isinstance(j, dict) and isinstance(j.get("worker"), str) and j["worker"]:
-                        worker_urls.append(j["worker"])
-                # De-dupe while preserving order
-                seen_w = set()
-                worker_urls = [u for u in worker_urls if not (u in seen_w or seen_w.add(u))]
-                diag["endpoints"]["workers_v1"] = {}
-                for wurl in worker_urls[:3]:
-                    diag["endpoints"]["workers_v1"][wurl] = _get_json(wurl)
-            except Exception as e:
-                diag["endpoints"]["jobs_v1_failed_details_error"] = str(e)
-
-            # v1 simulation often has additional fields compared to v2 (sometimes including worker assignment).
-            diag["endpoints"]["simulation_v1"] = _get_json(f"{base}/api/v1/simulation/{sim_id}/")
-            # NOTE: "events" endpoint is not present in the provided OpenAPI spec for this API host.
-            # Keep a placeholder so the diagnostics format is stable; callers can inspect other sources.
-            diag["endpoints"]["events"] = {"ok": False, "status_code": None, "text": "No /api/v2/*events* endpoint found in .docs/NVIDIA Air API.yaml"}
-            # services (v2 list is under simulations/nodes/interfaces/services/?simulation=<id>
-            diag["endpoints"]["services_v2"] = _get_json(
-                f"{base}/api/v2/simulations/nodes/interfaces/services/",
-                params={"simulation": sim_id},
-            )
-            # services (v1 has useful src_port info; filter to this simulation)
-            diag["endpoints"]["services_v1"] = _get_json(f"{base}/api/v1/service/", params={"simulation": sim_id})
-
-            out_path.write_text(json.dumps(diag, indent=2, default=str))
+            # The REST endpoints below are independent of each other, so fetch them
+            # concurrently: total wall time is the slowest call, not the sum of all.
+            endpoint_plan = {
+                # v2 sim details (often contains state_message/error_message)
+                "simulation": (f"{base}/api/v2/simulations/{sim_id}/", None),
+                # nodes (node-level error_message is very helpful)
+                # NOTE: external air.nvidia.com does not expose /api/v2/simulations/{id}/nodes/
+                # The OpenAPI spec defines /api/v2/simulations/nodes/?simulation=<id>
+                "nodes": (f"{base}/api/v2/simulations/nodes/", {"simulation": sim_id}),
+                # jobs + events (usually show the failing operation/reason)
+                # NOTE: OpenAPI spec defines /api/v2/jobs/?simulation=<id>
+                "jobs": (f"{base}/api/v2/jobs/", {"simulation": sim_id}),
+                # v1 simulation often has additional fields compared to v2 (sometimes including worker assignment).
+                "simulation_v1": (f"{base}/api/v1/simulation/{sim_id}/", None),
+                # services (v2 list is under simulations/nodes/interfaces/services/?simulation=<id>
+                "services_v2": (f"{base}/api/v2/simulations/nodes/interfaces/services/", {"simulation": sim_id}),
+                # services (v1 has useful src_port info; filter to this simulation)
+                "services_v1": (f"{base}/api/v1/service/", {"simulation": sim_id}),
+            }
+            with ThreadPoolExecutor(max_workers=len(endpoint_plan)) as pool:
+                pending = {
+                    key: pool.submit(_get_json, url, params)
+                    for key, (url, params) in endpoint_plan.items()
+                }
+                diag["endpoints"]["simulation"] = pending["simulation"].result()
+                diag["endpoints"]["nodes"] = pending["nodes"].result()
+                diag["endpoints"]["jobs"] = pending["jobs"].result()
+                # v1 job endpoints often include additional fields (e.g., "notes") that can contain failure reasons.
+                # /api/v2/jobs/{id}/ returns JobShort for non-worker clients (no error details).
+                try:
+                    jobs_json = diag["endpoints"]["jobs"].get("json") if isinstance(diag["endpoints"]["jobs"], dict) else None
+                    v2_job_results = []
+                    if isinstance(jobs_json, dict) and isinstance(jobs_json.get("results"), list):
+                        v2_job_results = jobs_json["results"]
+                    # One pass: failed job id -> priority (START failures first), first occurrence wins.
+                    # sorted() is stable, so jobs keep API order within each priority.
+                    failed_priority = {}
+                    for j in v2_job_results:
+                        if not isinstance(j, dict) or j.get("state") != "FAILED":
+                            continue
+                        jid = j.get("id")
+                        if jid and jid not in failed_priority:
+                            failed_priority[jid] = 0 if j.get("category") == "START" else 1
+                    failed_job_ids = sorted(failed_priority, key=failed_priority.get)[:5]
+
+                    diag["endpoints"]["jobs_v1_failed_details"] = dict(zip(
+                        failed_job_ids,
+                        pool.map(_get_json, [f"{base}/api/v1/job/{jid}/" for jid in failed_job_ids]),
+                    ))
+                    # If v1 job includes a worker URL, fetch that too (often has availability/health clues).
+                    worker_urls = []
+                    for job_detail in diag["endpoints"]["jobs_v1_failed_details"].values():
+                        if not isinstance(job_detail, dict):
+                            continue
+                        j = job_detail.get("json")
+                        if isinstance(j, dict) and isinstance(j.get("worker"), str) and j["worker"]:
+                            worker_urls.append(j["worker"])
+                    # De-dupe while preserving order
+                    seen_w = set()
+                    worker_urls = [u for u in worker_urls if not (u in seen_w or seen_w.add(u))][:3]
+                    diag["endpoints"]["workers_v1"] = dict(zip(worker_urls, pool.map(_get_json, worker_urls)))
+                except Exception as e:
+                    diag["endpoints"]["jobs_v1_failed_details_error"] = str(e)
+
+                diag["endpoints"]["simulation_v1"] = pending["simulation_v1"].result()
+                # NOTE: "events" endpoint is not present in the provided OpenAPI spec for this API host.
+                # Keep a placeholder so the diagnostics format is stable; callers can inspect other sources.
+                diag["endpoints"]["events"] = {"ok": False, "status_code": None, "text": "No /api/v2/*events* endpoint found in .docs/NVIDIA Air API.yaml"}
+                diag["endpoints"]["services_v2"] = pending["services_v2"].result()
+                diag["endpoints"]["services_v1"] = pending["services_v1"].result()
+
+            # orjson builds compact bytes quickly; stdlib json streams to the file instead of
+            # materializing one large string (response bodies can make this multi-MB).
+            if orjson is not None:
+                out_path.write_bytes(_json_dumps_pretty(diag))
+            else:
+                with out_path.open("w") as fp:
+                    json.dump(diag, fp, indent=2, default=str)
             print(f"\n  ℹ Wrote Air failure diagnostics: {out_path}")
             print(f"  ℹ Tip: you can also run: python scripts/air-tests/get_sim_info.py --sim-id {sim_id}")
         except Exception as e:
@@ -1355,15 +1744,15 @@ class AirBCMDeployer:
         if not sim_id:
             return False
         try:
-            resp = requests.delete(
+            resp = self.session.delete(
                 f"{self.api_base_url}/api/v2/simulations/{sim_id}/",
-                headers=self.headers,
-                timeout=60,
+                timeout=(10, 30),  # Fail fast on connect; the API answers deletes quickly
             )
-            return resp.status_code in (200, 202, 204)
+            # 404: already gone, which is what the caller wants
+            return resp.status_code in (200, 202, 204, 404)
         except Exception:
             return False
-
+    
     def enable_ssh_service(self):
         """
         Enable SSH service for the simulation using the Air SDK.
@@ -1386,16 +1775,8 @@ class AirBCMDeployer:
             return None
         
         try:
-            if getattr(self, "no_sdk", False):
-                raise RuntimeError("SDK disabled by --no-sdk")
-            from air_sdk import AirApi
-            
-            # Connect to Air SDK
-            air = AirApi(
-                username=self.username,
-                password=self.api_token,
-                api_url=self.api_base_url
-            )
+            # Connect to Air SDK (shared client)
+            air = self._get_air_sdk()
             
             # Get the simulation object
             sim = air.simulations.get(self.simulation_id)
@@ -1431,9 +1812,8 @@ class AirBCMDeployer:
         try:
             # Use v1 API which has complete service information including src_port (external port)
             # Filter by simulation ID to only get services for this simulation
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_base_url}/api/v1/service/",
-                headers=self.headers,
                 params={'simulation': self.simulation_id},
                 timeout=30
             )
@@ -1443,17 +1823,34 @@ class AirBCMDeployer:
                 # v1 API can return list directly or dict with results
                 services = data if isinstance(data, list) else data.get('results', [])
                 
-                # Look for SSH service for BCM head node
+                # Look for SSH service for BCM head node; filter on node first, then
+                # prefer the service bound to the detected outbound interface.
+                target_node = self.bcm_node_name
+                target_iface = getattr(self, 'bcm_outbound_interface', None)
+                _get = dict.get
+                chosen = None
                 for service in services:
-                    if (service.get('service_type') == 'ssh' and 
-                        service.get('node_name') == self.bcm_node_name):
-                        return {
-                            'hostname': service.get('host'),
-                            'port': service.get('src_port'),  # src_port is the external port
-                            'username': 'root',  # BCM uses root, configured via cloud-init
-                            'link': service.get('link'),
-                            'service_id': service.get('id')
-                        }
+                    if (
+                        not isinstance(service, dict)
+                        or _get(service, 'node_name') != target_node
+                        or _get(service, 'service_type') != 'ssh'
+                    ):
+                        continue
+                    if target_iface and _row_interface_name(service) == target_iface:
+                        chosen = service
+                        break  # Exact interface match: stop scanning
+                    if chosen is None:
+                        chosen = service  # First SSH service on the node is the fallback
+                
+                if chosen is not None:
+                    service = chosen
+                    return {
+                        'hostname': service.get('host'),
+                        'port': service.get('src_port'),  # src_port is the external port
+                        'username': 'root',  # BCM uses root, configured via cloud-init
+                        'link': service.get('link'),
+                        'service_id': service.get('id')
+                    }
             
             return None
             
@@ -1487,19 +1884,13 @@ class AirBCMDeployer:
         
         userdata_name = "bcm-cloudinit-password"  # Fixed name for reuse
         
-        headers = {
-            "Authorization": f"Bearer {self.jwt_token}",
-            "Content-Type": "application/json"
-        }
-        
         userdata_id = None
         
         # First, check if we already have this config (avoids 403 on create)
         try:
             print("  Checking for existing UserConfig...")
-            list_response = requests.get(
+            list_response = self.session.get(
                 f"{self.api_base_url}/api/v2/userconfigs/",
-                headers=headers,
                 timeout=30
             )
             if list_response.status_code == 200:
@@ -1508,10 +1899,12 @@ class AirBCMDeployer:
                         userdata_id = cfg.get('id')
                         print(f"    ✓ Found existing UserConfig: {userdata_id}")
                         
-                        # Update the content in case password changed
-                        update_response = requests.patch(
+                        # Update the content in case password changed (skip if it already matches)
+                        if cfg.get('content') == cloudinit_content:
+                            print(f"    ✓ UserConfig content is up to date")
+                            break
+                        update_response = self.session.patch(
                             f"{self.api_base_url}/api/v2/userconfigs/{userdata_id}/",
-                            headers=headers,
                             json={"content": cloudinit_content},
                             timeout=30
                         )
@@ -1538,9 +1931,8 @@ class AirBCMDeployer:
                 print(f"    [DEBUG] POST {self.api_base_url}/api/v2/userconfigs/")
                 print(f"    [DEBUG] Content size: {len(cloudinit_content)} bytes")
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/api/v2/userconfigs/",
-                headers=headers,
                 json=payload,
                 timeout=30
             )
@@ -1591,7 +1983,7 @@ class AirBCMDeployer:
         try:
             if getattr(self, "no_sdk", False):
                 raise RuntimeError("SDK disabled by --no-sdk")
-            from air_sdk import AirApi
+            import air_sdk  # noqa: F401 - availability check; the client is built by _get_air_sdk()
         except ImportError:
             print("  ⚠ air_sdk not installed. Install with: pip install air-sdk")
             return False
@@ -1602,15 +1994,10 @@ class AirBCMDeployer:
         try:
             # Initialize Air SDK for node operations
             print("  Connecting to Air SDK...")
-            air = AirApi(
-                username=self.username,
-                password=self.api_token,
-                api_url=self.api_base_url
-            )
+            air = self._get_air_sdk()
             
             # Get simulation nodes
             print("  Getting simulation nodes...")
-            sim = air.simulations.get(self.simulation_id)
             nodes = air.simulation_nodes.list(simulation=self.simulation_id)
             
             # Apply cloud-init to Ubuntu/Debian nodes that support it
@@ -1620,30 +2007,39 @@ class AirBCMDeployer:
             
             # Load topology to get node configurations
             topology_nodes = self._get_topology_nodes() or {}
+            skip_reason = self._cloudinit_skip_reason
+            
+            # Classify every topology node once; simulation nodes missing from the
+            # topology are classified by name when encountered.
+            skip_reasons = {name: skip_reason(name, meta) for name, meta in topology_nodes.items()}
+            skip = skipped_nodes.append
+            eligible = []
             
             for node in nodes:
                 node_name = node.name
-                topo_node = topology_nodes.get(node_name, {})
-                
-                # Check if node is a switch (by OS or function)
-                if self._is_switch_node(node_name, topo_node):
-                    skipped_nodes.append((node_name, 'switch'))
-                    continue
-                
-                # Check if node is a PXE boot client (by boot setting or OS)
-                if self._is_pxe_boot_node(node_name, topo_node):
-                    skipped_nodes.append((node_name, 'PXE boot'))
-                    continue
-                
-                print(f"  Applying cloud-init to {node_name}...")
-                
-                try:
+                reason = skip_reasons[node_name] if node_name in skip_reasons else skip_reason(node_name, {})
+                if reason:
+                    skip((node_name, reason))
+                else:
+                    eligible.append(node)
+            
+            # Each assignment is an independent API call; issue them concurrently
+            if eligible:
+                print(f"  Applying cloud-init to {len(eligible)} node(s)...")
+                with ThreadPoolExecutor(max_workers=min(16, len(eligible))) as pool:
                     # SDK expects a dictionary with 'user_data' key containing the config ID
-                    node.set_cloud_init_assignment({'user_data': userdata_id})
-                    print(f"    ✓ Cloud-init assigned to {node_name}")
-                    configured_count += 1
-                except Exception as e:
-                    print(f"    ⚠ Could not assign cloud-init to {node_name}: {e}")
+                    futures = {
+                        pool.submit(node.set_cloud_init_assignment, {'user_data': userdata_id}): node.name
+                        for node in eligible
+                    }
+                    for future in as_completed(futures):
+                        node_name = futures[future]
+                        try:
+                            future.result()
+                            print(f"    ✓ Cloud-init assigned to {node_name}")
+                            configured_count += 1
+                        except Exception as e:
+                            print(f"    ⚠ Could not assign cloud-init to {node_name}: {e}")
             
             if skipped_nodes:
                 print(f"\n  ℹ Skipped nodes (don't support cloud-init):")
@@ -1696,74 +2092,27 @@ class AirBCMDeployer:
         print(f"  New password: {self.default_password}")
         
         # Read SSH public key if available
-        ssh_pubkey = None
-        if self.ssh_public_key and Path(self.ssh_public_key).expanduser().exists():
-            ssh_pubkey = Path(self.ssh_public_key).expanduser().read_text().strip()
+        ssh_pubkey = getattr(self, '_ssh_pubkey_text', None)
+        if ssh_pubkey:
             print(f"  SSH public key: {self.ssh_public_key}")
         
         desired_hostname = getattr(self, "bcm_node_name", "bcm-01")
 
         # Create a shell script to run on the remote host
         # NOTE: This is fed via stdin to "bash -s" (no SCP) to avoid brittle scp/expect flows.
-        setup_script_content = f'''#!/bin/bash
-set -e
-
-echo "Configuring BCM head node..."
-
-# Set hostname (cloud-init usually does this; SSH bootstrap needs to be explicit)
-sudo hostnamectl set-hostname "{desired_hostname}"
-if grep -qE "^127\\.0\\.1\\.1\\s+" /etc/hosts; then
-  sudo sed -i -E "s/^127\\.0\\.1\\.1\\s+.*/127.0.1.1 {desired_hostname}/" /etc/hosts
-else
-  echo "127.0.1.1 {desired_hostname}" | sudo tee -a /etc/hosts >/dev/null
-fi
-echo "  ✓ Hostname set to {desired_hostname}"
-
-# Change ubuntu password
-echo "ubuntu:{self.default_password}" | sudo chpasswd
-echo "  ✓ Ubuntu password changed"
-
-# Change root password  
-echo "root:{self.default_password}" | sudo chpasswd
-echo "  ✓ Root password changed"
-
-# Enable root SSH login
-sudo sed -i 's/^#*PermitRootLogin.*/PermitRootLogin yes/' /etc/ssh/sshd_config
-echo "  ✓ Root SSH login enabled"
-
-if [ -n "{ssh_pubkey or ''}" ]; then
-  # Add SSH key for ubuntu user
-  mkdir -p ~/.ssh
-  chmod 700 ~/.ssh
-  echo '{ssh_pubkey or ''}' >> ~/.ssh/authorized_keys
-  chmod 600 ~/.ssh/authorized_keys
-  sort -u ~/.ssh/authorized_keys -o ~/.ssh/authorized_keys
-  echo "  ✓ Ubuntu SSH key added"
-
-  # Add SSH key for root user
-  sudo mkdir -p /root/.ssh
-  sudo chmod 700 /root/.ssh
-  echo '{ssh_pubkey or ''}' | sudo tee -a /root/.ssh/authorized_keys > /dev/null
-  sudo chmod 600 /root/.ssh/authorized_keys
-  echo "  ✓ Root SSH key added"
-else
-  echo "  ⚠ No SSH public key provided; skipping key setup"
-fi
-
-# Restart SSH and wait
-sudo systemctl restart ssh
-sleep 3
-echo "  ✓ SSH service restarted"
-echo "SETUP_COMPLETE"
-'''
+        # Values are shell-quoted so passwords/keys with special characters can't break the script.
+        setup_script_content = _NODE_SETUP_SCRIPT.substitute(
+            hostname=shlex.quote(desired_hostname),
+            password=shlex.quote(self.default_password),
+            pubkey=shlex.quote(ssh_pubkey or ''),
+        )
         
-        # Write setup script to a unique temp file (avoid collisions across concurrent runs)
+        # The setup script stays in memory (stdin / base64); only the expect fallback needs a
+        # script file, uniquely named to avoid collisions across concurrent runs.
         import tempfile
         ns = _local_namespace() or "default"
-        with tempfile.NamedTemporaryFile(prefix=f"air_node_setup_{ns}_", suffix=".sh", delete=False) as tf:
-            setup_script_file = Path(tf.name)
-        setup_script_file.write_text(setup_script_content)
-        setup_script_file.chmod(0o755)
+        expect_fd = None
+        expect_file = None
         
         host = ssh_info['hostname']
         port = ssh_info['port']
@@ -1785,37 +2134,31 @@ echo "SETUP_COMPLETE"
                 '-o', 'ConnectTimeout=5',
                 '-o', 'ConnectionAttempts=1',
             ]
+            # Poll the TCP port directly (no subprocess per attempt) with a short backoff.
+            # Login readiness is checked by the real setup command below, which retries
+            # on connection-level failures instead of a separate probe login.
+            sshpass_available = _command_exists('sshpass')
             ready = False
-            for attempt in range(1, 31):  # ~60-90s depending on sleep
-                sshpass_probe = subprocess.run(['which', 'sshpass'], capture_output=True).returncode == 0
-                if sshpass_probe:
-                    probe_cmd = ['sshpass', '-p', default_pass, 'ssh'] + common_opts + [
-                        '-p', str(port),
-                        f'ubuntu@{host}',
-                        'echo PROBE_OK'
-                    ]
-                    pr = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=15)
-                    if pr.returncode == 0 and "PROBE_OK" in (pr.stdout or ""):
-                        ready = True
-                        break
-                else:
-                    # Try a raw TCP connect check (best-effort) using bash builtin.
-                    pr = subprocess.run(
-                        ["bash", "-lc", f"timeout 3 bash -lc '</dev/tcp/{host}/{port}'"],
-                        capture_output=True,
-                        text=True,
-                    )
-                    if pr.returncode == 0:
-                        ready = True
-                        break
-                if attempt % 5 == 0:
-                    print(f"  (still waiting... attempt {attempt}/30)")
-                time.sleep(3)
+            deadline = time.monotonic() + 90
+            next_notice = time.monotonic() + 15
+            delay = 0.1
+            while time.monotonic() < deadline:
+                try:
+                    with socket.create_connection((host, int(port)), timeout=2):
+                        port_open = True
+                except OSError:
+                    port_open = False
+                if port_open:
+                    ready = True
+                    break
+                if time.monotonic() >= next_notice:
+                    print("  (still waiting for SSH...)")
+                    next_notice += 15
+                time.sleep(delay)
+                delay = min(delay * 1.5, 2.0)
             if not ready:
                 print("  ⚠ SSH service did not become ready in time (continuing anyway)")
 
-            # Check if sshpass is available (preferred method)
-            sshpass_available = subprocess.run(['which', 'sshpass'], capture_output=True).returncode == 0
             try_expect_fallback = False
             
             if sshpass_available:
@@ -1829,19 +2172,32 @@ echo "SETUP_COMPLETE"
                     f'ubuntu@{host}',
                     'bash -s'
                 ]
-                result = subprocess.run(
-                    ssh_cmd,
-                    input=setup_script_content,
-                    capture_output=True,
-                    text=True,
-                    timeout=180,
-                )
+                # sshd can accept TCP before it accepts logins; retry only connection-level
+                # failures (ssh exits 255), never script or authentication errors.
+                retry_deadline = time.monotonic() + 30
+                delay = 1.0
+                while True:
+                    result = subprocess.run(
+                        ssh_cmd,
+                        input=setup_script_content,
+                        capture_output=True,
+                        text=True,
+                        timeout=180,
+                    )
+                    stderr_lower = (result.stderr or "").lower()
+                    if (
+                        result.returncode != 255
+                        or not any(err in stderr_lower for err in _SSH_CONNECT_ERRORS)
+                        or time.monotonic() >= retry_deadline
+                    ):
+                        break
+                    print("  (SSH not accepting logins yet, retrying...)")
+                    time.sleep(delay)
+                    delay = min(delay * 2, 8.0)
                 
                 # Show output
                 if result.stdout:
-                    for line in result.stdout.strip().split('\n'):
-                        if line.strip():
-                            print(f"  {line}")
+                    _print_indented(result.stdout)
                 
                 if 'SETUP_COMPLETE' in (result.stdout or ""):
                     print("\n  ✓ Node configuration complete")
@@ -1856,7 +2212,7 @@ echo "SETUP_COMPLETE"
                     # If the image requires an interactive password-change flow, sshpass won't handle it.
                     # Fall back to expect which does.
                     combined = (result.stdout or "") + "\n" + (result.stderr or "")
-                    if any(s in combined.lower() for s in ["current password", "new password", "password expired", "must change", "you are required to change"]):
+                    if _PWCHANGE_RE.search(combined):
                         print("  ℹ Detected a forced password-change prompt; falling back to expect...")
                         try_expect_fallback = True
                         details["password_change_prompt"] = True
@@ -1866,6 +2222,20 @@ echo "SETUP_COMPLETE"
                         details["bootstrap_method"] = "ssh-sshpass-failed"
                         return False, details
 
+            if ((not sshpass_available) or try_expect_fallback) and pexpect is not None:
+                # Drive the interactive login in-process (handles forced password-change prompts)
+                print("\n  Using pexpect fallback (handles forced password-change prompts)...")
+                details["bootstrap_tool"] = "pexpect"
+                ok, saw_pwchange = self._bootstrap_with_pexpect(host, port, default_pass, setup_script_content)
+                if ok:
+                    details["password_change_prompt"] = saw_pwchange
+                    details["bootstrap_method"] = "ssh-pexpect-pwchange" if saw_pwchange else "ssh-pexpect-no-pwchange"
+                    print("\n  ✓ Node configuration complete")
+                    return True, details
+                print(f"\n  ⚠ Configuration may have issues")
+                details["bootstrap_method"] = "ssh-pexpect-failed"
+                return False, details
+            
             if (not sshpass_available) or try_expect_fallback:
                 # Fallback to expect
                 print("\n  Using expect fallback (handles forced password-change prompts)...")
@@ -1876,8 +2246,11 @@ echo "SETUP_COMPLETE"
                     details["bootstrap_method"] = "ssh-expect-missing"
                     return False, details
 
-                import base64
-                setup_script_b64 = base64.b64encode(setup_script_content.encode("utf-8")).decode("ascii")
+                import binascii
+                setup_script_b64 = binascii.b2a_base64(setup_script_content.encode("utf-8"), newline=False).decode("ascii")
+
+                # The expect script reports whether it saw a forced password change on this pipe
+                flag_r, flag_w = os.pipe()
 
                 # Create expect script.
                 # This mode handles the "forced password change on first login" flow
@@ -1927,6 +2300,11 @@ expect {{
 
 if {{$saw_pwchange == 0}} {{
     puts "\\nℹ No forced password-change prompt detected (logged in directly)"
+}} else {{
+    # Machine-readable flag for the caller, on a dedicated pipe rather than stdout
+    set flagfh [open "/dev/fd/{flag_w}" w]
+    puts $flagfh "AIR_PWCHANGE=1"
+    close $flagfh
 }}
 
 # Now run the setup script by decoding base64 on the remote side.
@@ -1937,29 +2315,38 @@ expect {{
     timeout {{ puts "\\n✗ Timed out waiting for SETUP_COMPLETE"; exit 3 }}
 }}
 '''
-                with tempfile.NamedTemporaryFile(prefix=f"air_password_config_{ns}_", suffix=".exp", delete=False) as tf:
-                    expect_file = Path(tf.name)
-                expect_file.write_text(expect_script)
-                expect_file.chmod(0o700)
-
-                result = subprocess.run(
-                    ['expect', str(expect_file)],
-                    capture_output=True,
-                    text=True,
-                    timeout=240
-                )
+                # Keep the script (it contains the new password) off disk: an anonymous in-memory
+                # file on Linux, otherwise a private (0600) file in /dev/shm or the temp dir.
+                if hasattr(os, 'memfd_create'):
+                    expect_fd = os.memfd_create(f"air_password_config_{ns}", os.MFD_CLOEXEC)
+                    os.write(expect_fd, expect_script.encode())
+                    expect_path = f"/proc/self/fd/{expect_fd}"
+                else:
+                    shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+                    fd, expect_path = tempfile.mkstemp(
+                        prefix=f"air_password_config_{ns}_", suffix=".exp", dir=shm_dir
+                    )
+                    with os.fdopen(fd, 'w') as f:
+                        f.write(expect_script)
+                    expect_file = Path(expect_path)
+
+                with os.fdopen(flag_r, 'rb') as flag_pipe:
+                    try:
+                        result = subprocess.run(
+                            ['expect', expect_path],
+                            pass_fds=(flag_w,) if expect_fd is None else (flag_w, expect_fd),
+                            capture_output=True,
+                            text=True,
+                            timeout=240
+                        )
+                    finally:
+                        os.close(flag_w)
+                    saw_pwchange = b'AIR_PWCHANGE=1' in flag_pipe.read()
 
                 if result.stdout:
-                    for line in result.stdout.strip().split('\n'):
-                        if line.strip() and not line.startswith('spawn'):
-                            print(f"  {line}")
+                    _print_indented(result.stdout, skip_prefix='spawn')
 
                 if result.returncode == 0 or 'SETUP_COMPLETE' in (result.stdout or ""):
-                    out = (result.stdout or "")
-                    saw_pwchange = "Detected forced password-change prompt" in out
-                    # Expect script explicitly prints one of:
-                    #   - "Detected forced password-change prompt ..."
-                    #   - "No forced password-change prompt detected (logged in directly)"
                     details["password_change_prompt"] = saw_pwchange
                     details["bootstrap_method"] = "ssh-expect-pwchange" if saw_pwchange else "ssh-expect-no-pwchange"
                     print("\n  ✓ Node configuration complete")
@@ -1990,12 +2377,88 @@ expect {{
             details["bootstrap_method"] = "ssh-error"
             return False, details
         finally:
-            # Clean up temp files
-            setup_script_file.unlink(missing_ok=True)
-            try:
-                expect_file.unlink(missing_ok=True)  # type: ignore[name-defined]
-            except Exception:
-                pass
+            # Clean up the expect script
+            if expect_fd is not None:
+                os.close(expect_fd)
+            if expect_file is not None:
+                expect_file.unlink(missing_ok=True)
+    
+    def _bootstrap_with_pexpect(self, host, port, old_password, setup_script_content):
+        """
+        Log in with the default password and run the setup script, answering any
+        forced password-change prompts along the way
+        
+        Args:
+            host: SSH hostname
+            port: SSH port
+            old_password: Default image password
+            setup_script_content: Shell script to run on the node
+            
+        Returns:
+            (ok, saw_pwchange)
+        """
+        import binascii
+        setup_script_b64 = binascii.b2a_base64(setup_script_content.encode("utf-8"), newline=False).decode("ascii")
+        
+        child = pexpect.spawn(
+            'ssh',
+            ['-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
+             '-p', str(port), f'ubuntu@{host}', 'bash -s'],
+            timeout=180,
+            encoding='utf-8',
+            codec_errors='replace',
+        )
+        saw_pwchange = False
+        try:
+            if child.expect([r'(?i)are you sure you want to continue connecting', r'(?i)password:']) == 0:
+                child.sendline('yes')
+                child.expect(r'(?i)password:')
+            child.sendline(old_password)
+            
+            # Common forced-change prompts differ slightly across images
+            pwchange_prompts = [
+                r'(?i)current.*password',
+                r'(?i)(retype|repeat) new.*password',
+                r'(?i)new.*password',
+                r'\$ $',
+                r'# $',
+                pexpect.TIMEOUT,
+            ]
+            while True:
+                idx = child.expect(pwchange_prompts)
+                if idx == 0:
+                    saw_pwchange = True
+                    print("  ℹ Detected forced password-change prompt (current password)")
+                    child.sendline(old_password)
+                elif idx == 1:
+                    saw_pwchange = True
+                    print("  ℹ Detected forced password-change prompt (retype new password)")
+                    child.sendline(self.default_password)
+                elif idx == 2:
+                    saw_pwchange = True
+                    print("  ℹ Detected forced password-change prompt (new password)")
+                    child.sendline(self.default_password)
+                else:
+                    break
+            
+            if not saw_pwchange:
+                print("  ℹ No forced password-change prompt detected (logged in directly)")
+            
+            # Run the setup script by decoding base64 on the remote side
+            child.sendline(f"echo {setup_script_b64} | base64 -d | bash")
+            child.expect('SETUP_COMPLETE')
+            print("  ✓ BCM head node configured successfully")
+            return True, saw_pwchange
+        except pexpect.TIMEOUT:
+            print("  ✗ Timed out waiting for the node during password bootstrap")
+            return False, saw_pwchange
+        except pexpect.EOF:
+            print("  ✗ SSH session closed during password bootstrap")
+            if child.before:
+                print(f"    output: {child.before.strip()[-200:]}")
+            return False, saw_pwchange
+        finally:
+            child.close(force=True)
     
     def create_ssh_config(self, ssh_info, simulation_name):
         """
@@ -2057,6 +2520,27 @@ expect {{
             project_ssh_dir.mkdir(mode=0o700, exist_ok=True)
             config_file = project_ssh_dir / sim_name_slug
         
+        # Multiplexed connections: every ssh/scp after the first reuses one session.
+        # The socket goes in a short fixed directory rather than under the checkout: %C is
+        # 40 hex characters and ssh binds a ~17-character temp name beside it first, all of
+        # which must fit the 108-byte Unix socket path. Too long a home dir: no multiplexing.
+        control_dir = Path.home() / ".ssh" / "cm"
+        control_path = control_dir / "%C"
+        if len(str(control_dir)) + len("/") + 40 + 17 < _SUN_PATH_MAX:
+            control_dir.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            control_dir.mkdir(mode=0o700, exist_ok=True)
+            multiplex_opts = f"  ControlMaster auto\n  ControlPath {control_path}\n  ControlPersist 10m\n"
+        else:
+            multiplex_opts = "  ControlMaster no\n"
+        
+        # Per-simulation known_hosts: the head node's key is recorded on first connect
+        # (StrictHostKeyChecking no) and verified from then on. Start fresh for each
+        # config, since a re-created simulation with the same name has a new host key.
+        known_hosts_file = _local_ssh_dir() / f"known_hosts_{sim_name_slug}"
+        known_hosts_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        known_hosts_file.write_text("")
+        known_hosts_file.chmod(0o600)
+        
         # Create config content - direct connection to BCM head node
         config_content = f"""# NVIDIA Air Simulation SSH Configuration
 # Simulation: {simulation_name}
@@ -2073,8 +2557,10 @@ Host air-{self.bcm_node_name}
   PreferredAuthentications publickey,password
   IdentityFile {self.ssh_private_key}
   StrictHostKeyChecking no
-  UserKnownHostsFile /dev/null
-
+  UserKnownHostsFile {known_hosts_file}
+  ServerAliveInterval 30
+  ServerAliveCountMax 3
+{multiplex_opts}
 # Alias for convenience
 Host bcm
   HostName {ssh_info['hostname']}
@@ -2083,8 +2569,10 @@ Host bcm
   PreferredAuthentications publickey,password
   IdentityFile {self.ssh_private_key}
   StrictHostKeyChecking no
-  UserKnownHostsFile /dev/null
-"""
+  UserKnownHostsFile {known_hosts_file}
+  ServerAliveInterval 30
+  ServerAliveCountMax 3
+{multiplex_opts}"""
         
         # Write config file
         config_file.parent.mkdir(parents=True, exist_ok=True)
@@ -2103,6 +2591,55 @@ Host bcm
         
         return config_file
     
+    def ensure_ssh_master(self, ssh_config_file):
+        """
+        Make sure the multiplexed SSH master for the head node is running, so the
+        scp/ssh calls that follow reuse one authenticated connection (best-effort).
+        
+        Returns:
+            True if a master is (now) running, False otherwise
+        """
+        if not ssh_config_file:
+            return False
+        try:
+            # Configs written before multiplexing was added have no ControlPath to share
+            if 'ControlPath' not in Path(ssh_config_file).read_text():
+                return False
+            host_alias = f'air-{self.bcm_node_name}'
+            check = subprocess.run(
+                ['ssh', '-F', str(ssh_config_file), '-O', 'check', host_alias],
+                capture_output=True,
+                timeout=10,
+            )
+            if check.returncode == 0:
+                return True
+            # -M -N -f: authenticate, then background the master without running a command;
+            # ControlPersist from the config stops it once idle.
+            start = subprocess.run(
+                ['ssh', '-F', str(ssh_config_file), '-o', 'BatchMode=yes', '-M', '-N', '-f', host_alias],
+                capture_output=True,
+                timeout=30,
+            )
+            return start.returncode == 0
+        except Exception:
+            return False
+    
+    def close_ssh_master(self, ssh_config_file):
+        """
+        Stop the multiplexed SSH master for the head node (best-effort), so a later
+        connection never tries to reuse a socket from a session that has gone away.
+        """
+        if not ssh_config_file:
+            return
+        try:
+            subprocess.run(
+                ['ssh', '-F', str(ssh_config_file), '-O', 'exit', f'air-{self.bcm_node_name}'],
+                capture_output=True,
+                timeout=10,
+            )
+        except Exception:
+            pass
+    
     def find_bcm_iso(self, bcm_version):
         """
         Find BCM ISO file in ./iso/ directory
@@ -2113,7 +2650,7 @@ Host bcm
         Returns:
             Path to ISO file, or None if not found
         """
-        iso_dir = Path(__file__).parent / '.iso'
+        iso_dir = _MODULE_DIR / '.iso'
         
         if not iso_dir.exists():
             print(f"\n⚠ ISO directory not found: {iso_dir}")
@@ -2123,27 +2660,36 @@ Host bcm
         # Extract major version number (10 or 11)
         major_version = bcm_version.split('.')[0]
         
-        # Look for ISO files matching the version
-        patterns = [
-            f'bcm-{major_version}*.iso',
-            f'BCM-{major_version}*.iso',
-            f'*bcm*{major_version}*.iso',
-        ]
-        
-        for pattern in patterns:
-            matches = list(iso_dir.glob(pattern))
-            if matches:
-                # Return the first match (or most recent if multiple)
-                iso_file = sorted(matches, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+        # Single directory pass; rank each ISO the way the old glob patterns were tried:
+        #   0: bcm-<major>*.iso / BCM-<major>*.iso, 1: *bcm*<major>*.iso, 2: any other *.iso
+        prefixes = (f'bcm-{major_version}', f'BCM-{major_version}')
+        loose_re = re.compile(rf'bcm.*{re.escape(major_version)}')
+        best = None
+        with os.scandir(iso_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('.') or not name.endswith('.iso'):
+                    continue
+                if name.startswith(prefixes):
+                    rank = 0
+                elif loose_re.search(name, 0, len(name) - 4):
+                    rank = 1
+                else:
+                    rank = 2
+                # Most recent file wins within a rank
+                key = (-rank, entry.stat().st_mtime)
+                if best is None or key > best[0]:
+                    best = (key, entry)
+        
+        if best is not None:
+            (neg_rank, _), entry = best
+            iso_file = iso_dir / entry.name
+            if neg_rank > -2:
                 print(f"\n✓ Found BCM ISO: {iso_file.name}")
-                print(f"  Size: {iso_file.stat().st_size / (1024**3):.2f} GB")
-                return iso_file
-        
-        # If no version-specific ISO, look for any ISO
-        all_isos = list(iso_dir.glob('*.iso'))
-        if all_isos:
-            iso_file = sorted(all_isos, key=lambda p: p.stat().st_mtime, reverse=True)[0]
-            print(f"\n⚠ Using ISO (version not verified): {iso_file.name}")
+                print(f"  Size: {entry.stat().st_size / (1024**3):.2f} GB")
+            else:
+                # No version-specific ISO; fall back to any ISO
+                print(f"\n⚠ Using ISO (version not verified): {iso_file.name}")
             return iso_file
         
         print(f"\n✗ No BCM ISO found in {iso_dir}")
@@ -2154,7 +2700,7 @@ Host bcm
     
     def upload_iso_to_bcm(self, iso_path, ssh_config_file):
         """
-        Upload BCM ISO to the head node via rsync
+        Upload BCM ISO to the head node over SSH (resumable)
         
         Args:
             iso_path: Local path to ISO file
@@ -2167,69 +2713,162 @@ Host bcm
         print(f"  Source: {iso_path}")
         print(f"  This may take 10-20 minutes depending on connection speed...")
         
-        # Wait for SSH service to stabilize after potential restart
-        print(f"  Waiting for SSH service to stabilize...")
-        time.sleep(15)
-        
-        # Verify SSH key authentication works before attempting rsync
+        # Poll until key-based SSH works (sshd may still be restarting) instead of a fixed sleep.
+        # With ControlMaster in the SSH config, the first successful probe also starts the
+        # shared master connection that the upload below reuses.
         print(f"  Verifying SSH key authentication...")
         ssh_test_cmd = [
             'ssh', '-F', str(ssh_config_file),
             '-o', 'BatchMode=yes',  # Fail if password required
-            '-o', 'ConnectTimeout=10',
+            '-o', 'ConnectTimeout=3',
             f'air-{self.bcm_node_name}',
             'echo SSH_KEY_AUTH_OK'
         ]
-        try:
-            test_result = subprocess.run(ssh_test_cmd, capture_output=True, text=True, timeout=30)
-            if 'SSH_KEY_AUTH_OK' in test_result.stdout:
-                print(f"  ✓ SSH key authentication verified")
-            else:
-                print(f"  ⚠ SSH key auth may not be working, will try anyway...")
-                print(f"    stdout: {test_result.stdout[:100] if test_result.stdout else 'empty'}")
-                print(f"    stderr: {test_result.stderr[:100] if test_result.stderr else 'empty'}")
-        except Exception as e:
-            print(f"  ⚠ Could not verify SSH key auth: {e}")
-            print(f"  ⚠ Continuing anyway - rsync may prompt for password")
+        test_result = None
+        deadline = time.monotonic() + 60
+        delay = 1.0
+        while True:
+            try:
+                test_result = subprocess.run(ssh_test_cmd, capture_output=True, text=True, timeout=30)
+            except Exception as e:
+                test_result = None
+                probe_error = e
+            if test_result is not None and 'SSH_KEY_AUTH_OK' in test_result.stdout:
+                break
+            # A definitive auth rejection won't fix itself by waiting
+            if test_result is not None and 'permission denied' in (test_result.stderr or '').lower():
+                break
+            if time.monotonic() + delay >= deadline:
+                break
+            time.sleep(delay)
+            delay = min(delay * 1.5, 5.0)
+        
+        if test_result is not None and 'SSH_KEY_AUTH_OK' in test_result.stdout:
+            print(f"  ✓ SSH key authentication verified")
+        elif test_result is not None:
+            print(f"  ⚠ SSH key auth may not be working, will try anyway...")
+            print(f"    stdout: {test_result.stdout[:100] if test_result.stdout else 'empty'}")
+            print(f"    stderr: {test_result.stderr[:100] if test_result.stderr else 'empty'}")
+        else:
+            print(f"  ⚠ Could not verify SSH key auth: {probe_error}")
+            print(f"  ⚠ Continuing anyway - the upload may prompt for password")
         
-        # Use rsync for reliable large file transfer
+        # Stream the ISO over the (multiplexed) SSH connection into dd on the head node.
+        # The ISO is a single opaque file, so rsync's checksumming buys nothing here.
         # Upload to /home/ubuntu/ since we connect as ubuntu user
-        ssh_cmd = f"ssh -F {ssh_config_file} -o StrictHostKeyChecking=no"
-        remote_path = f"air-{self.bcm_node_name}:/home/ubuntu/bcm.iso"
-        
-        # Reduce rsync verbosity: single progress line instead of per-file progress spam
-        cmd = [
-            'rsync',
-            '-az',
-            '--partial',             # Keep partial files on interrupt (enables resume)
-            '--info=progress2',      # Single progress line
-            '--no-inc-recursive',    # More stable progress output for large files
-            '-e', ssh_cmd,
-            str(iso_path),
-            remote_path
-        ]
+        host_alias = f'air-{self.bcm_node_name}'
+        remote_path = '/home/ubuntu/bcm.iso'
+        # Identity of the ISO a partial upload came from; only a matching one is resumed
+        remote_src = f'{remote_path}.src'
+        iso_path = Path(iso_path)
+        st = iso_path.stat()
+        total = st.st_size
+        mtime = int(st.st_mtime)
+        source_id = f'{iso_path.name} {total} {mtime}'
         
         try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=False,
-                text=True
+            # Resume support: a previous partial upload leaves a shorter file behind, plus a
+            # sidecar naming the ISO it came from; a completed one has the full size and the
+            # local mtime (like rsync's quick check).
+            probe = subprocess.run(
+                ['ssh', '-F', str(ssh_config_file), host_alias,
+                 f'stat -c "%s %Y" {remote_path} 2>/dev/null || echo "0 0"; cat {remote_src} 2>/dev/null'],
+                capture_output=True, text=True, timeout=60,
             )
-            print(f"\n✓ ISO uploaded successfully")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"\n✗ ISO upload failed: {e}")
-            return False
+            probe_lines = probe.stdout.splitlines()
+            try:
+                remote_size, remote_mtime = (int(x) for x in probe_lines[0].split()[:2])
+            except (IndexError, ValueError):
+                remote_size, remote_mtime = 0, 0
+            remote_source_id = probe_lines[1].strip() if len(probe_lines) > 1 else ''
+            
+            if remote_size == total and remote_mtime == mtime:
+                print(f"\n✓ ISO already present on head node (size and mtime match)")
+                return True
+            offset = 0
+            if 0 < remote_size < total:
+                if remote_source_id == source_id:
+                    offset = remote_size
+                    print(f"  Resuming upload at {offset / (1024**3):.2f} GB")
+                else:
+                    print(f"  Partial upload on head node is not from this ISO, starting over")
+            
+            # The sidecar is written before any data so every partial file has one; truncate
+            # drops anything past the resume point; the mtime is only stamped once the file is
+            # complete, so an interrupted upload is never mistaken for a finished one.
+            remote_cmd = (
+                f'echo {shlex.quote(source_id)} > {remote_src}'
+                f' && truncate -s {offset} {remote_path}'
+                f' && dd of={remote_path} bs=4M iflag=fullblock oflag=seek_bytes seek={offset} conv=notrunc status=none'
+                f' && test "$(stat -c %s {remote_path})" = {total}'
+                f' && touch -d @{mtime} {remote_path}'
+                f' && rm -f {remote_src}'
+            )
+            proc = subprocess.Popen(
+                ['ssh', '-F', str(ssh_config_file), host_alias, remote_cmd],
+                stdin=subprocess.PIPE,
+            )
+            sent = offset
+            started = time.monotonic()
+            next_report = started
+            try:
+                with open(iso_path, 'rb', buffering=0) as f:
+                    in_fd = f.fileno()
+                    out_fd = proc.stdin.fileno()
+                    # Kernel-side copy from the page cache into the pipe where supported;
+                    # otherwise (or if the kernel refuses a pipe target) plain read/write.
+                    use_sendfile = hasattr(os, 'sendfile')
+                    while sent < total:
+                        count = min(1 << 22, total - sent)
+                        if use_sendfile:
+                            try:
+                                n = os.sendfile(out_fd, in_fd, sent, count)
+                            except OSError as e:
+                                if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                                    raise
+                                use_sendfile = False
+                                continue
+                        else:
+                            f.seek(sent)
+                            chunk = f.read(count)
+                            n = len(chunk)
+                            if n:
+                                proc.stdin.write(chunk)
+                        if not n:
+                            break  # File shrank underneath us; the remote size check will fail
+                        sent += n
+                        now = time.monotonic()
+                        if now >= next_report:
+                            rate = (sent - offset) / max(now - started, 1e-6) / (1024**2)
+                            print(f"\r  {sent * 100 // total:3d}%  {sent / (1024**3):.2f}/{total / (1024**3):.2f} GB  {rate:.1f} MB/s",
+                                  end='', flush=True)
+                            next_report = now + 2
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass  # ssh exited early; its return code reports the failure
+            returncode = proc.wait()
         except FileNotFoundError:
-            print(f"\n✗ rsync not found. Please install rsync:")
-            print(f"    sudo apt-get install rsync")
+            print(f"\n✗ ssh not found. Please install the OpenSSH client:")
+            print(f"    sudo apt-get install openssh-client")
+            return False
+        except subprocess.TimeoutExpired:
+            print(f"\n✗ ISO upload failed: timed out checking for an existing upload")
             return False
+        
+        if returncode == 0:
+            print(f"\n✓ ISO uploaded successfully")
+            return True
+        print(f"\n✗ ISO upload failed: ssh exited with status {returncode}")
+        print(f"  Re-run the deployment to resume the upload")
+        return False
     
     def upload_install_script(self, bcm_version, ssh_config_file):
         """
         Upload and prepare bcm_install.sh on the head node
         
+        If scripts/patches/<bcm_version>.py exists locally, it is uploaded in the
+        same transfer to /home/ubuntu/bcm_patches/<bcm_version>.py
+        
         Args:
             bcm_version: BCM version string (10.x or 11.x)
             ssh_config_file: Path to SSH config file
@@ -2240,99 +2879,92 @@ Host bcm
         print(f"\n📜 Uploading BCM installation script...")
         
         # Read the template script
-        script_template = Path(__file__).parent / 'scripts' / 'bcm_install.sh'
+        script_template = _MODULE_DIR / 'scripts' / 'bcm_install.sh'
         if not script_template.exists():
             print(f"\n✗ Script template not found: {script_template}")
             return False
         
-        script_content = script_template.read_text()
+        template = _load_template(str(script_template), script_template.stat().st_mtime_ns)
         
         # Extract major version (10 or 11)
         major_version = bcm_version.split('.')[0]
         
-        # Replace placeholders (using __NAME__ format to avoid bash variable conflicts)
-        script_content = script_content.replace('__PASSWORD__', self.default_password)
-        script_content = script_content.replace('__PRODUCT_KEY__', self.bcm_product_key)
-        script_content = script_content.replace('__BCM_VERSION__', major_version)
-        script_content = script_content.replace('__BCM_FULL_VERSION__', bcm_version)
-        script_content = script_content.replace('__ADMIN_EMAIL__', self.bcm_admin_email)
-        script_content = script_content.replace('__EXTERNAL_INTERFACE__', self.bcm_outbound_interface)
-        script_content = script_content.replace('__MANAGEMENT_INTERFACE__', self.bcm_management_interface)
-        
-        # Write to temp file
-        temp_script = Path('/tmp/bcm_install.sh')
-        temp_script.write_text(script_content)
-        temp_script.chmod(0o755)
+        # Fill placeholders in one join over the pre-split template
+        # (using __NAME__ format to avoid bash variable conflicts)
+        subs = {
+            'PASSWORD': self.default_password,
+            'PRODUCT_KEY': self.bcm_product_key,
+            'BCM_VERSION': major_version,
+            'BCM_FULL_VERSION': bcm_version,
+            'ADMIN_EMAIL': self.bcm_admin_email,
+            'EXTERNAL_INTERFACE': self.bcm_outbound_interface,
+            'MANAGEMENT_INTERFACE': self.bcm_management_interface,
+        }
+        script_content = _render_template(template, subs)
         
-        # Upload via scp
-        ssh_cmd = f"-F {ssh_config_file} -o StrictHostKeyChecking=no"
-        remote_path = f"air-{self.bcm_node_name}:/home/ubuntu/bcm_install.sh"
+        files = [(script_content.encode(), 'bcm_install.sh', 0o755)]
         
-        cmd = [
-            'scp',
-            '-F', ssh_config_file,
-            '-o', 'StrictHostKeyChecking=no',
-            str(temp_script),
-            remote_path
-        ]
+        # Optional per-version patch for the installed Ansible collection, shipped in the same transfer
+        patch_src = _MODULE_DIR / 'scripts' / 'patches' / f'{bcm_version}.py'
+        if patch_src.exists():
+            print(f"  Including BCM collection patch: {patch_src.name}")
+            files.append((patch_src.read_bytes(), f'bcm_patches/{patch_src.name}', 0o644))
+        else:
+            print("  ℹ No BCM collection patch for this version")
         
         try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            self._push_files(ssh_config_file, files)
             print(f"  ✓ Script uploaded")
-            
-            # Make executable on remote
-            ssh_make_exec = [
-                'ssh',
-                '-F', ssh_config_file,
-                '-o', 'StrictHostKeyChecking=no',
-                f'air-{self.bcm_node_name}',
-                'chmod +x /home/ubuntu/bcm_install.sh'
-            ]
-            subprocess.run(ssh_make_exec, check=True, capture_output=True)
-            
             return True
         except subprocess.CalledProcessError as e:
             print(f"\n✗ Script upload failed: {e}")
+            if e.stderr:
+                print(f"    {e.stderr.decode(errors='replace').strip()[:300]}")
             return False
     
-    def upload_bcm_collection_patch(self, bcm_version, ssh_config_file):
+    def _push_files(self, ssh_config_file, files, remote_dir='/home/ubuntu', post_cmd=None, check=True):
         """
-        Upload an optional per-BCM-version collection patch script to the head node.
-
-        If scripts/patches/<bcm_version>.py exists locally, upload it to:
-          /home/ubuntu/bcm_patches/<bcm_version>.py
+        Copy several small files to the head node in a single SSH round trip
+        
+        Builds a tar archive in memory and unpacks it remotely, so file modes
+        and subdirectories are created in the same step as the copy.
+        
+        Args:
+            ssh_config_file: Path to SSH config file
+            files: List of (content_bytes, relative_remote_path, mode) tuples
+            remote_dir: Directory on the head node the paths are relative to
+            post_cmd: Optional shell command to run (in remote_dir) after unpacking,
+                      in the same SSH session
+            check: Raise if the remote command fails
+            
+        Returns:
+            subprocess.CompletedProcess (stdout/stderr as bytes)
+            
+        Raises:
+            subprocess.CalledProcessError if check is set and the remote command fails
         """
-        patch_src = Path(__file__).parent / 'scripts' / 'patches' / f'{bcm_version}.py'
-        if not patch_src.exists():
-            print("  ℹ No BCM collection patch for this version")
-            return True
-
-        print(f"\n🩹 Uploading BCM collection patch: {patch_src.name}...")
-
-        remote_dir = "/home/ubuntu/bcm_patches"
-        ssh_mkdir = [
+        import io
+        import tarfile
+        
+        buf = io.BytesIO()
+        now = time.time()
+        with tarfile.open(fileobj=buf, mode='w') as tar:
+            for content, name, mode in files:
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                info.mode = mode
+                info.mtime = now
+                tar.addfile(info, io.BytesIO(content))
+        
+        cmd = [
             'ssh',
-            '-F', ssh_config_file,
-            '-o', 'StrictHostKeyChecking=no',
+            '-F', str(ssh_config_file),
             f'air-{self.bcm_node_name}',
-            f'mkdir -p {remote_dir}'
+            f'mkdir -p {shlex.quote(remote_dir)} && tar --no-same-owner -xpf - -C {shlex.quote(remote_dir)}'
+            + (f' && cd {shlex.quote(remote_dir)} && {post_cmd}' if post_cmd else '')
         ]
-        scp_cmd = [
-            'scp',
-            '-F', ssh_config_file,
-            '-o', 'StrictHostKeyChecking=no',
-            str(patch_src),
-            f"air-{self.bcm_node_name}:{remote_dir}/{patch_src.name}",
-        ]
-        try:
-            subprocess.run(ssh_mkdir, check=True, capture_output=True)
-            subprocess.run(scp_cmd, check=True, capture_output=True, text=True)
-            print("  ✓ Patch uploaded")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"\n✗ Patch upload failed: {e}")
-            return False
-
+        return subprocess.run(cmd, input=buf.getvalue(), check=check, capture_output=True)
+    
     def execute_bcm_install(self, ssh_config_file):
         """
         Execute BCM installation script on the head node
@@ -2349,31 +2981,85 @@ Host bcm
         print(f"    ssh -F {ssh_config_file} air-{self.bcm_node_name} 'tail -f /home/ubuntu/ansible_bcm_install.log'")
         print("")
         
-        # Execute the install script via SSH
-        # Use sudo since we're connecting as ubuntu user
-        cmd = [
+        # Run the install script detached on the head node (nohup, under sudo since we
+        # connect as ubuntu) and follow its output with tail. A dropped connection then only
+        # interrupts the log stream: we reconnect and keep tailing until the script exits.
+        host_alias = f'air-{self.bcm_node_name}'
+        out_file = '/home/ubuntu/bcm_install.out'
+        rc_file = '/home/ubuntu/bcm_install.rc'
+        pid_file = '/home/ubuntu/bcm_install.pid'
+        # Own connection rather than the shared master: ServerAlive only applies to the
+        # connection that owns the TCP session, and this stream runs for 30-45 minutes with
+        # no timeout, so a silently dropped link must be noticed here to reach the reconnect loop.
+        ssh_base = [
             'ssh',
-            '-F', ssh_config_file,
-            '-o', 'StrictHostKeyChecking=no',
-            '-o', 'ServerAliveInterval=60',
-            '-o', 'ServerAliveCountMax=30',
-            f'air-{self.bcm_node_name}',
-            'sudo /home/ubuntu/bcm_install.sh'
+            '-F', str(ssh_config_file),
+            '-o', 'ControlMaster=no',
+            '-o', 'ControlPath=none',
+            '-o', 'ServerAliveInterval=30',
+            '-o', 'ServerAliveCountMax=3',
+            host_alias,
         ]
+        start_cmd = (
+            # Create the log before tail looks for it (the job's own redirect runs in the background)
+            f"rm -f {rc_file}; : > {out_file}; "
+            # setsid keeps the job out of the SSH session (no SIGHUP on disconnect); the subshell
+            # re-parents it so it is reaped on exit instead of leaving tail --pid waiting on a zombie.
+            f"(setsid nohup sudo bash -c '/home/ubuntu/bcm_install.sh; echo $? > {rc_file}' >> {out_file} 2>&1 < /dev/null & "
+            f"echo $! > {pid_file}); "
+            f"tail -n +1 -f --pid=$(cat {pid_file}) {out_file}"
+        )
+        status_cmd = (
+            f"if [ -f {rc_file} ]; then echo RC $(cat {rc_file}); "
+            f"elif [ -d /proc/$(cat {pid_file}) ]; then echo RUNNING; "
+            f"else echo GONE; fi"
+        )
+        follow_cmd = f"tail -n 20 -f --pid=$(cat {pid_file}) {out_file}"
         
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=False,
-                text=True
-            )
+        cmd = ssh_base + [start_cmd]
+        reconnects = 0
+        delay = 5.0
+        while True:
+            stream = subprocess.run(cmd, check=False, capture_output=False, text=True)
+            
+            try:
+                status = subprocess.run(ssh_base + [status_cmd], capture_output=True, text=True, timeout=60)
+                state = (status.stdout or '').split()
+            except subprocess.TimeoutExpired:
+                state = []
+            if state[:1] == ['RC']:
+                returncode = int(state[1]) if len(state) > 1 and state[1].lstrip('-').isdigit() else 1
+                break
+            if state[:1] == ['GONE']:
+                returncode = None
+                break
+            
+            # Still running (or the head node is unreachable right now): re-attach to the log
+            reconnects += 1
+            if reconnects > 20:
+                print(f"\n✗ Lost connection to the head node too many times; the install may still be running")
+                print(f"  Follow it with: ssh -F {ssh_config_file} {host_alias} 'tail -f {out_file}'")
+                return False
+            if state[:1] != ['RUNNING']:
+                time.sleep(delay)
+                delay = min(delay * 2, 60.0)
+            else:
+                delay = 5.0
+            if stream.returncode == 255:  # ssh's own failure code: the connection went away
+                print(f"\n  ℹ Connection to head node dropped; re-attaching to install log...")
+            else:
+                print(f"\n  ℹ Install log stream ended; re-attaching to install log...")
+            cmd = ssh_base + [follow_cmd]
+        
+        if returncode == 0:
             print("\n✓ BCM installation completed successfully!")
             return True
-        except subprocess.CalledProcessError as e:
-            print(f"\n✗ BCM installation failed with exit code {e.returncode}")
-            print(f"  Check logs: ssh -F {ssh_config_file} air-{self.bcm_node_name} 'cat /home/ubuntu/ansible_bcm_install.log'")
-            return False
+        if returncode is None:
+            print(f"\n✗ BCM installation exited without recording a status")
+        else:
+            print(f"\n✗ BCM installation failed with exit code {returncode}")
+        print(f"  Check logs: ssh -F {ssh_config_file} air-{self.bcm_node_name} 'cat /home/ubuntu/ansible_bcm_install.log'")
+        return False
     
     def install_bcm(self, bcm_version, ssh_config_file, iso_path=None):
         """
@@ -2405,15 +3091,12 @@ Host bcm
         if not self.upload_iso_to_bcm(iso_path, ssh_config_file):
             raise RuntimeError("Failed to upload BCM ISO")
         
-        # Step 3: Upload install script (bcm-ansible-installer is cloned on remote host)
+        # Step 3: Upload install script and optional per-version collection patch
+        # (bcm-ansible-installer is cloned on remote host)
         if not self.upload_install_script(bcm_version, ssh_config_file):
             raise RuntimeError("Failed to upload installation script")
-
-        # Step 4: Upload optional per-version patch for the installed Ansible collection
-        if not self.upload_bcm_collection_patch(bcm_version, ssh_config_file):
-            raise RuntimeError("Failed to upload BCM collection patch")
         
-        # Step 5: Execute installation
+        # Step 4: Execute installation
         if not self.execute_bcm_install(ssh_config_file):
             raise RuntimeError("BCM installation failed")
     
@@ -2503,10 +3186,12 @@ Host bcm
         success = True
         enabled_features = []
         
-        # Check which features are enabled
+        # Check which features are enabled, resolving each config path once for the passes below
         for feature_name, config in features.items():
             if isinstance(config, dict) and config.get('enabled', False):
-                enabled_features.append((feature_name, config))
+                config_file = config.get('config_file')
+                local_config_path = topology_dir / config_file if config_file else None
+                enabled_features.append((feature_name, config, local_config_path))
         
         if not enabled_features:
             print("  All features disabled in features.yaml")
@@ -2514,35 +3199,57 @@ Host bcm
         
         print(f"  Enabled features: {', '.join(f[0] for f in enabled_features)}")
         
-        for feature_name, config in enabled_features:
-            print(f"\n  Configuring: {feature_name}")
-            
-            config_file = config.get('config_file')
-            if not config_file:
-                print(f"    ⚠ No config_file specified for {feature_name}")
-                continue
-            
-            local_config_path = topology_dir / config_file
-            if not local_config_path.exists():
-                print(f"    ⚠ Config file not found: {local_config_path}")
-                continue
+        # Pre-flight: every file must be present before anything touches the head node,
+        # so a typo in features.yaml can't leave it half-configured
+        problems = []
+        ztp_path = None
+        for feature_name, config, local_config_path in enabled_features:
+            if local_config_path is None:
+                problems.append(f"No config_file specified for {feature_name}")
+            elif not local_config_path.exists():
+                problems.append(f"Config file not found for {feature_name}: {local_config_path}")
+            if feature_name == 'bcm_switches' and config.get('ztp_script'):
+                ztp_path = topology_dir / config['ztp_script']
+                if not ztp_path.exists():
+                    problems.append(f"ZTP script not found for {feature_name}: {ztp_path}")
+        if problems:
+            for problem in problems:
+                print(f"    ✗ {problem}")
+            print("\n  ✗ No features applied - fix features.yaml and re-run")
+            return False
+        
+        # One SSH handshake for all the scp/ssh calls below
+        self.ensure_ssh_master(ssh_config_file)
+        
+        # The cmsh features build on each other (networks -> interfaces -> nodes -> WLM) and
+        # stay sequential; the ZTP upload is just a file copy, so it runs alongside them.
+        with ThreadPoolExecutor(max_workers=1) as ztp_pool:
+            ztp_future = None
+            if ztp_path is not None:
+                ztp_future = ztp_pool.submit(self._upload_ztp_script, ztp_path, ssh_config_file)
+        
+            cmsh_batch = []
+            for feature_name, config, local_config_path in enabled_features:
+                print(f"\n  Configuring: {feature_name}")
             
-            # Determine how to execute based on feature type
-            if feature_name == 'workload_manager':
-                # cm-wlm-setup requires special handling
-                wlm_type = config.get('type', 'slurm')
-                success = self._run_wlm_setup(local_config_path, ssh_config_file, wlm_type) and success
-            elif feature_name == 'bcm_switches':
-                # Switches may need ZTP script copied
-                ztp_script = config.get('ztp_script')
-                if ztp_script:
-                    ztp_path = topology_dir / ztp_script
-                    if ztp_path.exists():
-                        success = self._upload_ztp_script(ztp_path, ssh_config_file) and success
-                success = self._run_cmsh_script(local_config_path, ssh_config_file) and success
-            else:
-                # Default: run as cmsh script
-                success = self._run_cmsh_script(local_config_path, ssh_config_file) and success
+                # Determine how to execute based on feature type
+                runner = self._FEATURE_RUNNERS.get(feature_name)
+                if runner is None:
+                    # Default (including bcm_switches, whose ZTP script uploads in the background):
+                    # run as cmsh script; consecutive ones share one SSH session
+                    cmsh_batch.append(local_config_path)
+                    continue
+                # Special handling runs after the cmsh features queued so far
+                if cmsh_batch:
+                    success = self._run_cmsh_scripts(cmsh_batch, ssh_config_file) and success
+                    cmsh_batch = []
+                success = runner(self, local_config_path, config, ssh_config_file) and success
+        
+            if cmsh_batch:
+                success = self._run_cmsh_scripts(cmsh_batch, ssh_config_file) and success
+        
+            if ztp_future is not None:
+                success = ztp_future.result() and success
         
         if success:
             print("\n  ✓ All features configured successfully")
@@ -2553,22 +3260,18 @@ Host bcm
     
     def _run_cmsh_script(self, local_script_path, ssh_config_file):
         """Upload and execute a cmsh script on the BCM head node"""
-        remote_script = f"/tmp/{local_script_path.name}"
+        remote_script = shlex.quote(f"/tmp/{local_script_path.name}")
         
         try:
-            # Upload script
-            subprocess.run([
-                'scp', '-F', ssh_config_file,
-                str(local_script_path),
-                f"air-{self.bcm_node_name}:{remote_script}"
-            ], check=True, capture_output=True)
-            
-            # Execute with cmsh
-            result = subprocess.run([
-                'ssh', '-F', ssh_config_file,
-                f"air-{self.bcm_node_name}",
-                f"cmsh -f {remote_script}"
-            ], capture_output=True, text=True)
+            # Upload (via stdin) and execute with cmsh in one SSH session.
+            # close_fds=False: our own fds are non-inheritable anyway (PEP 446), and it lets
+            # subprocess take the cheaper posix_spawn path instead of fork + close loop.
+            with open(local_script_path, 'rb') as script:
+                result = subprocess.run([
+                    'ssh', '-F', str(ssh_config_file),
+                    f"air-{self.bcm_node_name}",
+                    f"cat > {remote_script} && cmsh -f {remote_script}"
+                ], stdin=script, capture_output=True, text=True, close_fds=False)
             
             if result.returncode == 0:
                 print(f"    ✓ {local_script_path.name} executed")
@@ -2576,53 +3279,119 @@ Host bcm
             else:
                 print(f"    ✗ {local_script_path.name} failed: {result.stderr}")
                 return False
-        except subprocess.CalledProcessError as e:
+        except OSError as e:
             print(f"    ✗ Error running {local_script_path.name}: {e}")
             return False
     
+    def _run_cmsh_scripts(self, local_script_paths, ssh_config_file):
+        """
+        Upload and execute several cmsh scripts, in order, in one SSH session
+        
+        Each script still runs in its own `cmsh -f` (so every script starts at
+        cmsh's top level, as when run alone); only the upload and session are shared.
+        
+        Returns:
+            True if every script succeeded
+        """
+        if len(local_script_paths) == 1:
+            return self._run_cmsh_script(local_script_paths[0], ssh_config_file)
+        
+        # Index prefix keeps order and avoids clashes between same-named files
+        names = [f"{i:02d}_{path.name}" for i, path in enumerate(local_script_paths)]
+        try:
+            files = [(path.read_bytes(), name, 0o644) for path, name in zip(local_script_paths, names)]
+        except OSError as e:
+            print(f"    ✗ Error reading cmsh scripts: {e}")
+            return False
+        run_all = (
+            'for f in ' + ' '.join(shlex.quote(n) for n in names) + '; do '
+            'out=$(cmsh -f "$f" 2>&1); rc=$?; '
+            'printf "__CMSH_RC__ %s %s\\n" "$f" "$rc"; '
+            '[ "$rc" -eq 0 ] || printf "%s\\n" "$out"; '
+            'done'
+        )
+        try:
+            result = self._push_files(ssh_config_file, files, remote_dir='/tmp/bcm_features',
+                                      post_cmd=run_all, check=False)
+        except OSError as e:
+            print(f"    ✗ Error running cmsh scripts: {e}")
+            return False
+        
+        # Per-script status markers, each followed by that script's output if it failed
+        status = {}
+        failure_output = {}
+        current = None
+        for line in result.stdout.decode(errors='replace').splitlines():
+            if line.startswith('__CMSH_RC__ '):
+                _, current, rc = line.split(' ', 2)
+                status[current] = rc.strip() == '0'
+            elif current is not None and not status[current]:
+                failure_output.setdefault(current, []).append(line)
+        
+        # One write for the whole report, so the background ZTP upload's line can't land mid-report
+        all_ok = True
+        report = []
+        for path, name in zip(local_script_paths, names):
+            if status.get(name):
+                report.append(f"    ✓ {path.name} executed")
+                continue
+            all_ok = False
+            if name in status:
+                report.append(f"    ✗ {path.name} failed: {chr(10).join(failure_output.get(name, []))}")
+            else:
+                report.append(f"    ✗ {path.name} did not run: {result.stderr.decode(errors='replace').strip()}")
+        sys.stdout.write('\n'.join(report) + '\n')
+        sys.stdout.flush()
+        return all_ok
+    
     def _upload_ztp_script(self, local_ztp_path, ssh_config_file):
         """Upload ZTP script to BCM's HTTP directory for switch provisioning"""
         remote_ztp = "/cm/images/default-image/http/cumulus-ztp.sh"
         
         try:
-            # Upload to temporary location first, then move with sudo
-            subprocess.run([
-                'scp', '-F', ssh_config_file,
-                str(local_ztp_path),
-                f"air-{self.bcm_node_name}:/tmp/cumulus-ztp.sh"
-            ], check=True, capture_output=True)
-            
-            subprocess.run([
-                'ssh', '-F', ssh_config_file,
-                f"air-{self.bcm_node_name}",
-                f"sudo mkdir -p /cm/images/default-image/http && sudo mv /tmp/cumulus-ztp.sh {remote_ztp} && sudo chmod 644 {remote_ztp}"
-            ], check=True, capture_output=True)
+            # Stream the script into a root-owned destination in one SSH session;
+            # install(1) creates the directory, writes the file and sets its mode in one sudo call
+            with open(local_ztp_path, 'rb') as ztp:
+                subprocess.run([
+                    'ssh', '-F', str(ssh_config_file),
+                    f"air-{self.bcm_node_name}",
+                    f"sudo install -D -m 644 /dev/stdin {remote_ztp}"
+                ], stdin=ztp, check=True, capture_output=True, close_fds=False)
             
-            print(f"    ✓ ZTP script uploaded to {remote_ztp}")
+            print(f"    ✓ ZTP script installed to {remote_ztp}")
             return True
         except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode(errors='replace').strip() if e.stderr else ''
+            print(f"    ⚠ sudo install of ZTP script to {remote_ztp} failed (exit {e.returncode})"
+                  + (f": {stderr}" if stderr else ""))
+            return False
+        except OSError as e:
             print(f"    ⚠ ZTP script upload failed: {e}")
             return False
     
+    def _run_wlm_feature(self, config_path, config, ssh_config_file):
+        """features.yaml runner for workload_manager (type: slurm or kubernetes)"""
+        return self._run_wlm_setup(config_path, ssh_config_file, config.get('type', 'slurm'))
+    
+    # features.yaml entries that need more than `cmsh -f <config_file>`, mapped to the
+    # method that runs them as runner(self, config_path, config, ssh_config_file) -> bool
+    _FEATURE_RUNNERS = {
+        'workload_manager': _run_wlm_feature,
+    }
+    
     def _run_wlm_setup(self, config_path, ssh_config_file, wlm_type):
         """Run cm-wlm-setup with the provided configuration"""
         print(f"    Running cm-wlm-setup for {wlm_type}...")
         
         try:
-            # Upload config file
-            remote_config = f"/tmp/{config_path.name}"
-            subprocess.run([
-                'scp', '-F', ssh_config_file,
-                str(config_path),
-                f"air-{self.bcm_node_name}:{remote_config}"
-            ], check=True, capture_output=True)
-            
-            # Run cm-wlm-setup
-            result = subprocess.run([
-                'ssh', '-F', ssh_config_file,
-                f"air-{self.bcm_node_name}",
-                f"sudo cm-wlm-setup -c {remote_config}"
-            ], capture_output=True, text=True)
+            # Upload config file (via stdin) and run cm-wlm-setup in one SSH session
+            remote_config = shlex.quote(f"/tmp/{config_path.name}")
+            with open(config_path, 'rb') as config:
+                result = subprocess.run([
+                    'ssh', '-F', str(ssh_config_file),
+                    f"air-{self.bcm_node_name}",
+                    f"cat > {remote_config} && sudo cm-wlm-setup -c {remote_config}"
+                ], stdin=config, capture_output=True, text=True, close_fds=False)
             
             if result.returncode == 0:
                 print(f"    ✓ Workload manager ({wlm_type}) configured")
@@ -2630,30 +3399,31 @@ Host bcm
             else:
                 print(f"    ⚠ cm-wlm-setup returned non-zero: {result.stderr}")
                 return False
-        except subprocess.CalledProcessError as e:
+        except OSError as e:
             print(f"    ✗ Error running cm-wlm-setup: {e}")
             return False
 
 
+@lru_cache(maxsize=None)
 def _command_exists(cmd: str) -> bool:
-    try:
-        return subprocess.run(["which", cmd], capture_output=True).returncode == 0
-    except Exception:
-        return False
+    # PATH lookup in-process (no `which` fork); cached since tools don't appear mid-run
+    return shutil.which(cmd) is not None
 
 
 def _strip_flag_args(argv: list[str], flags: set[str]) -> list[str]:
     """Remove any occurrences of the provided flags (boolean flags only)."""
-    out: list[str] = []
-    for a in argv:
-        if a in flags:
-            continue
-        out.append(a)
-    return out
+    if not flags:
+        return list(argv)
+    return [a for a in argv if a not in flags]
 
 
 def main():
     """Main entry point"""
+    from dotenv import load_dotenv
+    
+    # Load environment variables from .env file
+    load_dotenv()
+    
     parser = argparse.ArgumentParser(
         description='Automate BCM deployment on NVIDIA Air',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -2758,6 +3528,20 @@ Examples:
     
     args = parser.parse_args()
     
+    return run_deployment(args)
+
+
+def run_deployment(args, progress=None):
+    """
+    Run (or resume) a deployment for parsed command-line arguments
+    
+    Args:
+        args: argparse.Namespace from main()
+        progress: ProgressTracker to use (a fresh one is loaded if None)
+        
+    Returns:
+        int: Process exit code
+    """
     # Determine API URL with priority: --api-url > --internal > AIR_API_URL env var > default
     if args.api_url:
         api_base_url = args.api_url
@@ -2768,7 +3552,8 @@ Examples:
     
     try:
         # Initialize progress tracker
-        progress = ProgressTracker()
+        if progress is None:
+            progress = ProgressTracker()
         
         # Handle --clear-progress
         if args.clear_progress:
@@ -2788,6 +3573,21 @@ Examples:
             if not progress.get_last_step():
                 print("\n  Starting fresh (no previous progress)")
         
+        # A cloud-init fallback was interrupted before its restart got going: finish it
+        if progress.get('phase') == 'awaiting_fallback_restart' and not args.skip_cloud_init:
+            print("\n  Previous run was falling back from cloud-init; continuing with --skip-cloud-init")
+            args.skip_cloud_init = True
+        
+        # Steps to skip, read once from the checkpoint; steps below only ever complete
+        # in order, so this matches what is_step_completed() would say at each one
+        resumed = progress.completed_steps() if args.resume else frozenset()
+        
+        # Nothing left to resume: skip authentication and API calls entirely
+        if args.resume and progress.all_steps_completed():
+            print("\n✓ Deployment already completed - nothing to resume")
+            print("  Use --clear-progress to start a new deployment")
+            return 0
+        
         # Initialize deployer
         print("\n" + "="*60)
         print("NVIDIA Air BCM Automated Deployment")
@@ -2825,7 +3625,7 @@ Examples:
         ssh_config_file = None
         
         # Step: BCM version selection
-        if args.resume and progress.is_step_completed('bcm_version_selected'):
+        if 'bcm_version_selected' in resumed:
             bcm_version = progress.get('bcm_version')
             collection_name = progress.get('collection_name')
             iso_path_str = progress.get('bcm_iso_path')
@@ -2853,7 +3653,7 @@ Examples:
                                    bcm_iso_path=str(bcm_iso_path) if bcm_iso_path else None)
         
         # Step: Password configuration
-        if args.resume and progress.is_step_completed('password_configured'):
+        if 'password_configured' in resumed:
             deployer.default_password = progress.get('default_password', 'Nvidia1234!')
             print(f"  [resume] Using saved password")
         else:
@@ -2862,7 +3662,7 @@ Examples:
                                    default_password=deployer.default_password)
         
         # Step: Simulation name
-        if args.resume and progress.is_step_completed('simulation_name_set'):
+        if 'simulation_name_set' in resumed:
             simulation_name = progress.get('simulation_name')
             print(f"  [resume] Simulation name: {simulation_name}")
         elif args.name:
@@ -2894,12 +3694,13 @@ Examples:
                 sys.exit(1)
         
         # Step: Create simulation
-        if args.resume and progress.is_step_completed('simulation_created'):
+        if 'simulation_created' in resumed:
             deployer.simulation_id = progress.get('simulation_id')
             deployer.bcm_node_name = progress.get('bcm_node_name', 'bcm-01')
             deployer.bcm_outbound_interface = progress.get('bcm_outbound_interface', 'eth0')
             deployer.bcm_management_interface = progress.get('bcm_management_interface', 'eth0')
             deployer.userconfig_id = progress.get('userconfig_id')
+            deployer.topology_file = topology_file  # Node settings for cloud-init/PXE/switch checks
             print(f"  [resume] Simulation ID: {deployer.simulation_id}")
             print(f"  [resume] BCM outbound interface: {deployer.bcm_outbound_interface}")
             print(f"  [resume] BCM management interface: {deployer.bcm_management_interface}")
@@ -2925,7 +3726,7 @@ Examples:
                                    topology_dir=str(topology_dir))
         
         # Step: Assign cloud-init to nodes (needs simulation to exist)
-        if args.resume and progress.is_step_completed('cloudinit_configured'):
+        if 'cloudinit_configured' in resumed:
             cloudinit_success = progress.get('cloudinit_success', False)
             deployer.userconfig_id = progress.get('userconfig_id')
             print(f"  [resume] Cloud-init configured: {cloudinit_success}")
@@ -2934,14 +3735,14 @@ Examples:
             progress.complete_step('cloudinit_configured', cloudinit_success=cloudinit_success)
         
         # Step: Start simulation
-        if args.resume and progress.is_step_completed('simulation_started'):
+        if 'simulation_started' in resumed:
             print(f"  [resume] Simulation already started")
         else:
             deployer.start_simulation()
             progress.complete_step('simulation_started')
         
         # Step: Wait for simulation loaded
-        if args.resume and progress.is_step_completed('simulation_loaded'):
+        if 'simulation_loaded' in resumed:
             print(f"  [resume] Simulation already loaded")
         else:
             if not deployer.wait_for_simulation_loaded(timeout=300):
@@ -2950,7 +3751,7 @@ Examples:
                 # Auto-fallback: if cloud-init was used and sim fails to load, retry once with --skip-cloud-init
                 # (requires sshpass or expect for the SSH/password bootstrap path).
                 if (not args.skip_cloud_init) and cloudinit_success:
-                    have_expect = _command_exists("expect")
+                    have_expect = pexpect is not None or _command_exists("expect")
                     have_sshpass = _command_exists("sshpass")
 
                     if not (have_expect or have_sshpass):
@@ -2962,40 +3763,58 @@ Examples:
                     print("\nSimulation failed to load with cloud-init; falling back to SSH/expect method.")
                     print("Deleting simulation and restarting from the beginning with --skip-cloud-init...")
 
-                    # Delete current sim (best-effort)
-                    deleted = deployer.delete_simulation()
+                    # Delete current sim (best-effort), once the diagnostics have captured its state.
+                    # The delete runs in the background while progress is cleared.
+                    deployer.wait_for_diagnostics()
+                    delete_future = _run_in_background(deployer.delete_simulation, name="air-delete")
+
+                    # Clear progress so we truly restart from the beginning, recording the
+                    # fallback in the same write: if we die before the rerun gets going, the
+                    # next run still knows to skip cloud-init
+                    progress.transition(clear=True, phase='awaiting_fallback_restart')
+
+                    try:
+                        deleted = delete_future.result(timeout=60)
+                    except Exception:
+                        deleted = False
                     if deleted:
                         print("  ✓ Simulation deleted")
                     else:
                         print("  ⚠ Simulation delete failed (continuing anyway)")
+                    # The rerun builds its own deployer; don't hold this one's connections open
+                    deployer.close()
 
-                    # Clear progress so we truly restart from the beginning
-                    progress.clear()
-
-                    # Re-run this script with the same args, forcing skip-cloud-init
-                    rerun_args = _strip_flag_args(sys.argv[1:], {"--resume"})
+                    # Re-run the deployment in-process with the same args, forcing skip-cloud-init
+                    # (the command line is rebuilt only so the log shows the equivalent invocation)
+                    rerun_args = _strip_flag_args(sys.argv[1:], {"--resume", "--clear-progress"})
                     if "--skip-cloud-init" not in rerun_args:
                         rerun_args.append("--skip-cloud-init")
-                    # IMPORTANT: do NOT pass --clear-progress here. That flag is designed to
-                    # clear progress and exit cleanly. We already called progress.clear()
-                    # above, so the rerun will start fresh automatically.
+                    fallback_args = argparse.Namespace(**vars(args))
+                    fallback_args.skip_cloud_init = True
+                    fallback_args.resume = False
+                    # IMPORTANT: do NOT set clear_progress here. That flag is designed to
+                    # clear progress and exit cleanly. We already cleared progress above,
+                    # so the rerun will start fresh automatically.
+                    fallback_args.clear_progress = False
 
                     print(f"\n[auto-fallback] Re-running: {sys.executable} {Path(__file__).name} {' '.join(rerun_args)}")
-                    rc = subprocess.run([sys.executable, str(Path(__file__).resolve()), *rerun_args]).returncode
-                    return rc
+                    return run_deployment(fallback_args, progress)
 
                 return 1
-            progress.complete_step('simulation_loaded')
+            progress.complete_step('simulation_loaded', phase=None)  # Any pending fallback is done
         
         # Step: Enable SSH service
-        if args.resume and progress.is_step_completed('ssh_enabled'):
+        if 'ssh_enabled' in resumed:
             print(f"  [resume] SSH service already enabled")
         else:
             deployer.enable_ssh_service()
             progress.complete_step('ssh_enabled')
         
+        # The SSH service record doesn't depend on the node being up: look it up while we wait
+        ssh_info_future = _run_in_background(deployer.get_ssh_service_info, name="air-ssh-info")
+        
         # Step: Wait for node ready
-        if args.resume and progress.is_step_completed('node_ready'):
+        if 'node_ready' in resumed:
             print(f"  [resume] Node already ready")
         else:
             bcm_node = deployer.wait_for_node_ready(deployer.bcm_node_name, timeout=900)
@@ -3006,7 +3825,10 @@ Examples:
         print("Configuring SSH Access")
         print("="*60)
         
-        ssh_info = deployer.get_ssh_service_info()
+        ssh_info = ssh_info_future.result()
+        if not ssh_info:
+            # Not there yet (e.g. enabled by hand in the Air UI during the wait): look again
+            ssh_info = deployer.get_ssh_service_info()
         
         if not ssh_info:
             print("\n✗ Error: SSH service not available")
@@ -3014,7 +3836,7 @@ Examples:
             print("   Then run with --resume to continue")
             return 1
         
-        if args.resume and progress.is_step_completed('ssh_configured'):
+        if 'ssh_configured' in resumed:
             ssh_config_file = progress.get('ssh_config_file')
             print(f"  [resume] SSH config: {ssh_config_file}")
         else:
@@ -3049,7 +3871,7 @@ Examples:
         
         # Step: Install BCM
         if not args.skip_ansible:
-            if args.resume and progress.is_step_completed('bcm_installed'):
+            if 'bcm_installed' in resumed:
                 print(f"  [resume] BCM already installed")
             else:
                 deployer.install_bcm(bcm_version, ssh_config_file, bcm_iso_path)
@@ -3057,20 +3879,27 @@ Examples:
         else:
             print("\n--skip-ansible specified, skipping BCM installation")
         
-        # Step: Post-install features (if features.yaml exists in topology directory)
-        if not args.skip_ansible:
-            if args.resume and progress.is_step_completed('features_configured'):
-                print(f"  [resume] Features already configured")
-            else:
-                # Get topology_dir from progress or current resolution
-                saved_topology_dir = progress.get('topology_dir')
-                feature_topology_dir = Path(saved_topology_dir) if saved_topology_dir else topology_dir
-                
-                deployer.run_post_install_features(feature_topology_dir, ssh_config_file)
-                progress.complete_step('features_configured')
-        
-        # Mark completed
-        progress.complete_step('completed')
+        # features_configured and completed land back to back: one progress write for both
+        # (batch() still writes on the way out if closing the SSH master raises)
+        with progress.batch():
+            # Step: Post-install features (if features.yaml exists in topology directory)
+            if not args.skip_ansible:
+                if 'features_configured' in resumed:
+                    print(f"  [resume] Features already configured")
+                else:
+                    # Get topology_dir from progress or current resolution
+                    saved_topology_dir = progress.get('topology_dir')
+                    feature_topology_dir = Path(saved_topology_dir) if saved_topology_dir else topology_dir
+                    
+                    deployer.run_post_install_features(feature_topology_dir, ssh_config_file)
+                    progress.complete_step('features_configured')
+            
+            # Done with the head node over SSH and with the Air API: close both connections
+            deployer.close_ssh_master(ssh_config_file)
+            deployer.close()
+            
+            # Mark completed
+            progress.complete_step('completed')
         
         # Print summary
         deployer.print_summary(bcm_version, ssh_config_file)
@@ -17,6 +17,7 @@ import argparse
 import hashlib
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Load env manually
 env_path = Path(__file__).parent.parent / ".env"
@@ -36,6 +37,9 @@ if not API_TOKEN or not USERNAME:
     print("ERROR: Set AIR_API_TOKEN and AIR_USERNAME in .env")
     sys.exit(1)
 
+# Concurrent DELETEs when cleaning up (kept small to stay clear of API rate limits)
+DELETE_WORKERS = 4
+
 def main():
     parser = argparse.ArgumentParser(description="Clean up UserConfigs")
     parser.add_argument("--delete", action="store_true", help="Delete duplicates and test configs")
@@ -78,9 +82,12 @@ def main():
         print("ERROR: --show-all and --show-id cannot be used together")
         sys.exit(2)
     
+    # One keep-alive session for all calls (the delete workers share its connection pool)
+    session = requests.Session()
+    
     # Login
     print(f"Authenticating to {API_URL}...")
-    resp = requests.post(f"{API_URL}/api/v1/login/", data={
+    resp = session.post(f"{API_URL}/api/v1/login/", data={
         'username': USERNAME,
         'password': API_TOKEN
     })
@@ -97,7 +104,7 @@ def main():
     url = f"{API_URL}/api/v2/userconfigs/"
     
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = session.get(url, headers=headers)
         if resp.status_code != 200:
             print(f"Failed to list configs: {resp.status_code}")
             sys.exit(1)
@@ -115,12 +122,22 @@ def main():
         return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
     def _fetch_userconfig(cfg_id: str) -> dict | None:
-        r = requests.get(f"{API_URL}/api/v2/userconfigs/{cfg_id}/", headers=headers)
+        r = session.get(f"{API_URL}/api/v2/userconfigs/{cfg_id}/", headers=headers)
         if r.status_code == 200:
             return r.json()
         print(f"  ✗ Failed to fetch UserConfig {cfg_id}: {r.status_code}")
         return None
 
+    def _delete_userconfigs(cfgs):
+        """DELETE the given configs concurrently; yields (cfg, status_code) as each finishes."""
+        with ThreadPoolExecutor(max_workers=max(1, min(DELETE_WORKERS, len(cfgs)))) as pool:
+            futures = {
+                pool.submit(session.delete, f"{API_URL}/api/v2/userconfigs/{cfg['id']}/", headers=headers): cfg
+                for cfg in cfgs
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result().status_code
+
     # Show modes
     if args.show_all or args.show_id:
         wanted_ids = None
@@ -190,19 +207,18 @@ def main():
         deleted = 0
         failed = 0
         for cfg in to_delete:
-            cfg_id = cfg.get("id")
-            cfg_name = cfg.get("name") or "<unknown-name>"
-            if not cfg_id:
+            if not cfg.get("id"):
                 failed += 1
-                print(f"  ✗ Skipping (missing id): {cfg_name}")
-                continue
-            resp = requests.delete(f"{API_URL}/api/v2/userconfigs/{cfg_id}/", headers=headers)
-            if resp.status_code in (200, 204):
+                print(f"  ✗ Skipping (missing id): {cfg.get('name') or '<unknown-name>'}")
+        for cfg, status_code in _delete_userconfigs([c for c in to_delete if c.get("id")]):
+            cfg_id = cfg["id"]
+            cfg_name = cfg.get("name") or "<unknown-name>"
+            if status_code in (200, 204):
                 deleted += 1
                 print(f"  ✓ Deleted: {cfg_name} ({cfg_id})")
             else:
                 failed += 1
-                print(f"  ✗ Failed: {cfg_name} ({cfg_id}) ({resp.status_code})")
+                print(f"  ✗ Failed: {cfg_name} ({cfg_id}) ({status_code})")
 
         print(f"\nDone! Deleted: {deleted}, Failed: {failed}")
         return
@@ -275,14 +291,13 @@ def main():
     
     deleted = 0
     failed = 0
-    for cfg in to_delete:
-        resp = requests.delete(f"{API_URL}/api/v2/userconfigs/{cfg['id']}/", headers=headers)
-        if resp.status_code in (200, 204):
+    for cfg, status_code in _delete_userconfigs(to_delete):
+        if status_code in (200, 204):
             deleted += 1
             print(f"  ✓ Deleted: {cfg['name']}")
         else:
             failed += 1
-            print(f"  ✗ Failed: {cfg['name']} ({resp.status_code})")
+            print(f"  ✗ Failed: {cfg['name']} ({status_code})")
     
     print(f"\nDone! Deleted: {deleted}, Failed: {failed}")
 
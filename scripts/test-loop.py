@@ -35,6 +35,12 @@ _RSYNC_PROGRESS_RE = re.compile(
     r"^\s*\d[\d,]*\s+\d{1,3}%\s+[\d.]+\s*[kMG]B/s\s+\d+:\d{2}:\d{2}\s*$"
 )
 
+# deploy_bcm_air.py output lines that carry the simulation name/id (checked on every line,
+# so compiled once here rather than looked up in re's cache per line)
+_SIM_NAME_RE = re.compile(r"^Creating simulation from JSON file:\s*(.+)\s*$")
+_SIM_ID_RE = re.compile(r"^Simulation ID:\s*([0-9a-fA-F-]{36})\s*$")
+_BARE_ID_RE = re.compile(r"^\s*ID:\s*([0-9a-fA-F-]{36})\s*$")
+
 
 @dataclass(frozen=True)
 class TestCase:
@@ -343,15 +349,15 @@ def _run_deploy(test: TestCase, extra_env: Dict[str, str], dry_run: bool) -> Tup
             # Capture sim name/id from deploy_bcm_air.py output so cleanup works even if
             # deploy_bcm_air.py clears progress.json in non-interactive mode.
             if sim_name is None:
-                m = re.search(r"^Creating simulation from JSON file:\s*(.+)\s*$", line)
+                m = _SIM_NAME_RE.match(line)
                 if m:
                     sim_name = m.group(1).strip()
             if sim_id is None:
-                m = re.search(r"^Simulation ID:\s*([0-9a-fA-F-]{36})\s*$", line.strip())
+                m = _SIM_ID_RE.match(line.strip())
                 if m:
                     sim_id = m.group(1)
                 else:
-                    m2 = re.search(r"^\s*ID:\s*([0-9a-fA-F-]{36})\s*$", line)
+                    m2 = _BARE_ID_RE.match(line)
                     if m2:
                         sim_id = m2.group(1)
         rc = p.wait()
@@ -28,6 +28,10 @@ import requests
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SSH_DIR = REPO_ROOT / ".ssh"
 
+# One keep-alive session for every Air API call (login, simulations, nodes, services)
+# so later requests reuse the TLS connection instead of handshaking again
+_SESSION = requests.Session()
+
 
 def parse_dotenv(path: Path) -> Dict[str, str]:
     """Minimal .env parser."""
@@ -54,7 +58,7 @@ def parse_dotenv(path: Path) -> Dict[str, str]:
 def air_login(api_url: str, username: str, api_token: str) -> str:
     """Login to Air API and return JWT token."""
     login_url = f"{api_url.rstrip('/')}/api/v1/login/"
-    resp = requests.post(
+    resp = _SESSION.post(
         login_url,
         data={"username": username, "password": api_token},
         timeout=30,
@@ -69,7 +73,7 @@ def air_login(api_url: str, username: str, api_token: str) -> str:
 def get_all_simulations(api_url: str, jwt: str) -> List[dict]:
     """Get all simulations."""
     list_url = f"{api_url.rstrip('/')}/api/v2/simulations/"
-    resp = requests.get(
+    resp = _SESSION.get(
         list_url,
         headers={"Authorization": f"Bearer {jwt}"},
         timeout=30,
@@ -91,7 +95,7 @@ def find_simulation_by_name(api_url: str, jwt: str, name: str) -> Optional[str]:
 def get_simulation_nodes(api_url: str, jwt: str, sim_id: str) -> List[dict]:
     """Get simulation nodes."""
     url = f"{api_url.rstrip('/')}/api/v2/simulations/nodes/?simulation={sim_id}"
-    resp = requests.get(
+    resp = _SESSION.get(
         url,
         headers={"Authorization": f"Bearer {jwt}"},
         timeout=30,
@@ -104,7 +108,7 @@ def get_simulation_nodes(api_url: str, jwt: str, sim_id: str) -> List[dict]:
 def get_simulation_services(api_url: str, jwt: str, sim_id: str) -> List[dict]:
     """Get services for a simulation."""
     url = f"{api_url.rstrip('/')}/api/v2/simulations/services/?simulation={sim_id}"
-    resp = requests.get(
+    resp = _SESSION.get(
         url,
         headers={"Authorization": f"Bearer {jwt}"},
         timeout=30,